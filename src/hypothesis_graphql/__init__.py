@@ -1,2 +1,3 @@
 from ._strategies.validation import validate_scalar_strategy
+from .batch import generate, generate_parallel
 from .strategies import from_schema, mutations, queries
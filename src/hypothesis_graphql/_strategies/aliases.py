@@ -1,43 +1,82 @@
-from typing import Dict, List, Optional, Tuple
+"""Aliases for fields that can't be merged in a single response.
+
+Fields with the same name but different arguments conflict if they are merged into the same response object, e.g.
+when a field is selected on an interface and in an inline fragment on its implementation. Such fields get aliases.
+
+Aliases are resolved in a single pass over a finished operation. Nodes are never modified - if a field gets an alias,
+then it is copied together with its ancestors, and all other nodes are reused as is. Therefore, generated subtrees
+could be safely shared between documents.
+"""
+from typing import AbstractSet, Callable, Dict, Optional
 
 import graphql
 
 from ..types import SelectionNodes
 
 
-def maybe_add_alias_to_node(node: graphql.SelectionNode, seen: Dict[Tuple[str, str], List]) -> None:
+def add_aliases(selections: SelectionNodes, fields: Optional[AbstractSet[str]] = None) -> SelectionNodes:
+    """Add aliases to conflicting fields within the given top-level selections.
+
+    :param fields: Names of top-level fields that may contain conflicting fields. Other ones are skipped.
+        By default, all top-level fields are processed.
+    """
+    # Top-level fields are unique by name, therefore they don't need aliases. Every top-level field has its own scope,
+    # that includes all nested selections, as fields with the same name on different levels could be merged together
+    # with their parents
+    def resolve(node: graphql.SelectionNode) -> graphql.SelectionNode:
+        if fields is not None and node.name.value not in fields:  # type: ignore
+            return node
+        return _resolve_selection_set(node, {})
+
+    return map_selections(selections, resolve)
+
+
+def _resolve_node(node: graphql.SelectionNode, seen: Dict[str, int]) -> graphql.SelectionNode:
+    if isinstance(node, graphql.FieldNode) and node.arguments:
+        name = node.name.value
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        if count:
+            # The counter is per field name, so aliases are unique. The values could be the same, so it is not
+            # technically necessary, but this is safe and simpler, but a bit reduces the possible input variety
+            return _resolve_selection_set(node, seen, alias=graphql.NameNode(value=f"{name}_{count}"))
+    return _resolve_selection_set(node, seen)
+
+
+def _resolve_selection_set(
+    node: graphql.SelectionNode, seen: Dict[str, int], alias: Optional[graphql.NameNode] = None
+) -> graphql.SelectionNode:
+    """Resolve aliases in the selection set of the given node and copy it if anything is changed."""
+    selection_set = node.selection_set  # type: ignore
+    if selection_set is not None:
+        selections = map_selections(selection_set.selections, lambda child: _resolve_node(child, seen))
+        if selections is not selection_set.selections:
+            selection_set = graphql.SelectionSetNode(selections=selections)
+    if alias is None and selection_set is node.selection_set:  # type: ignore
+        return node
     if isinstance(node, graphql.FieldNode):
-        maybe_add_alias(node, node.arguments, seen)
-        if node.selection_set.selections:
-            for selection in node.selection_set.selections:
-                maybe_add_alias_to_node(selection, seen)
-    if isinstance(node, graphql.InlineFragmentNode):
-        for selection in node.selection_set.selections:
-            maybe_add_alias(selection, selection.arguments, seen)
-            if selection.selection_set.selections:
-                for sub_selection in selection.selection_set.selections:
-                    maybe_add_alias_to_node(sub_selection, seen)
-
-
-def maybe_add_alias(
-    field_node: graphql.FieldNode, arguments: List[graphql.ArgumentNode], seen: Dict[Tuple[str, str], List]
-) -> None:
-    for argument in arguments:
-        key = (field_node.name.value, argument.name.value)
-        value = argument.value
-        if key in seen:
-            # Simply add an alias, the values could be the same, so it not technically necessary, but this is safe
-            # and simpler, but a bit reduces the possible input variety
-            field_node.alias = graphql.NameNode(value=f"{field_node.name.value}_{len(seen[key])}")
-            seen[key].append(value)
-        else:
-            seen[key] = [value]
-
-
-def add_selection_aliases(nodes: Optional[SelectionNodes]) -> Optional[SelectionNodes]:
-    """Add aliases to fields that have conflicting argument types."""
-    if nodes and len(nodes) > 1:
-        seen: Dict[Tuple[str, str], List] = {}
-        for node in nodes:
-            maybe_add_alias_to_node(node, seen)
-    return nodes
+        return graphql.FieldNode(
+            alias=alias or node.alias,
+            name=node.name,
+            arguments=node.arguments,
+            directives=node.directives,
+            selection_set=selection_set,
+        )
+    return graphql.InlineFragmentNode(
+        type_condition=node.type_condition,  # type: ignore
+        directives=node.directives,
+        selection_set=selection_set,
+    )
+
+
+def map_selections(
+    selections: SelectionNodes, func: Callable[[graphql.SelectionNode], graphql.SelectionNode]
+) -> SelectionNodes:
+    """Apply `func` to all selections. The same sequence is returned if no node is changed."""
+    resolved = []
+    changed = False
+    for node in selections:
+        new = func(node)
+        changed |= new is not node
+        resolved.append(new)
+    return resolved if changed else selections
@@ -1,9 +1,16 @@
+from typing import List, Optional
+
 import graphql
 
 from ..types import SelectionNodes
 
 
-def make_document_node(selections: SelectionNodes, *, kind: graphql.OperationType) -> graphql.DocumentNode:
+def make_document_node(
+    selections: SelectionNodes,
+    *,
+    kind: graphql.OperationType,
+    variable_definitions: Optional[List[graphql.VariableDefinitionNode]] = None,
+) -> graphql.DocumentNode:
     """Create top-level node for an operation AST."""
     return graphql.DocumentNode(
         kind="document",
@@ -11,15 +18,22 @@ def make_document_node(selections: SelectionNodes, *, kind: graphql.OperationTyp
             graphql.OperationDefinitionNode(
                 kind="operation_definition",
                 operation=kind,
+                variable_definitions=variable_definitions or None,
                 selection_set=graphql.SelectionSetNode(kind="selection_set", selections=selections),
             )
         ],
     )
 
 
-def make_query(selections: SelectionNodes) -> graphql.DocumentNode:
-    return make_document_node(selections, kind=graphql.OperationType.QUERY)
+def make_query(
+    selections: SelectionNodes, variable_definitions: Optional[List[graphql.VariableDefinitionNode]] = None
+) -> graphql.DocumentNode:
+    return make_document_node(selections, kind=graphql.OperationType.QUERY, variable_definitions=variable_definitions)
 
 
-def make_mutation(selections: SelectionNodes) -> graphql.DocumentNode:
-    return make_document_node(selections, kind=graphql.OperationType.MUTATION)
+def make_mutation(
+    selections: SelectionNodes, variable_definitions: Optional[List[graphql.VariableDefinitionNode]] = None
+) -> graphql.DocumentNode:
+    return make_document_node(
+        selections, kind=graphql.OperationType.MUTATION, variable_definitions=variable_definitions
+    )
@@ -1,54 +1,100 @@
 """Set of function for creating GraphQL nodes.
 
 Most of them exist to avoid using lambdas, which might become expensive in Hypothesis in some cases.
+Name nodes are taken from the schema index and shared by all created nodes, see `SchemaIndex`.
 """
-from functools import lru_cache
-from typing import Callable, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import attr
 import graphql
 
+from ..cache import CacheInfo
 from ..types import SelectionNodes
-from .aliases import add_selection_aliases
+from .index import SchemaIndex
 
 FieldNodeInput = Tuple[List[graphql.ArgumentNode], Optional[SelectionNodes]]
 
 
-@lru_cache()
-def inline_fragment(type_name: str) -> Callable[[SelectionNodes], graphql.InlineFragmentNode]:
+def inline_fragment(type_condition: graphql.NamedTypeNode) -> Callable[[SelectionNodes], graphql.InlineFragmentNode]:
     def factory(nodes: SelectionNodes) -> graphql.InlineFragmentNode:
         return graphql.InlineFragmentNode(
-            type_condition=graphql.NamedTypeNode(
-                name=graphql.NameNode(value=type_name),
-            ),
+            type_condition=type_condition,
             selection_set=graphql.SelectionSetNode(kind="selection_set", selections=nodes),
         )
 
     return factory
 
 
-@lru_cache()
-def argument(name: str) -> Callable[[graphql.ValueNode], graphql.ArgumentNode]:
+def argument(name: graphql.NameNode) -> Callable[[graphql.ValueNode], graphql.ArgumentNode]:
     def factory(value: graphql.ValueNode) -> graphql.ArgumentNode:
-        return graphql.ArgumentNode(name=graphql.NameNode(value=name), value=value)
+        return graphql.ArgumentNode(name=name, value=value)
 
     return factory
 
 
-@lru_cache()
-def field(name: str) -> Callable[[FieldNodeInput], graphql.FieldNode]:
+def field(name: graphql.NameNode) -> Callable[[FieldNodeInput], graphql.FieldNode]:
     def factory(tup: FieldNodeInput) -> graphql.FieldNode:
+        selections = tup[1]
+        if selections is None:
+            # Leaf fields don't have a selection set
+            return graphql.FieldNode(name=name, arguments=tup[0])
         return graphql.FieldNode(
-            name=graphql.NameNode(value=name),
+            name=name,
             arguments=tup[0],
-            selection_set=graphql.SelectionSetNode(kind="selection_set", selections=add_selection_aliases(tup[1])),
+            selection_set=graphql.SelectionSetNode(kind="selection_set", selections=selections),
         )
 
     return factory
 
 
-@lru_cache()
-def object_field(name: str) -> Callable[[graphql.ValueNode], graphql.ObjectFieldNode]:
+def object_field(name: graphql.NameNode) -> Callable[[graphql.ValueNode], graphql.ObjectFieldNode]:
     def factory(value: graphql.ValueNode) -> graphql.ObjectFieldNode:
-        return graphql.ObjectFieldNode(name=graphql.NameNode(value=name), value=value)
+        return graphql.ObjectFieldNode(name=name, value=value)
 
     return factory
+
+
+def enum_values(type_: graphql.GraphQLEnumType) -> Tuple[graphql.EnumValueNode, ...]:
+    return tuple(graphql.EnumValueNode(value=value) for value in type_.values)
+
+
+@attr.s(slots=True)
+class FactoryTable:
+    """Factories and enum value nodes of a single `GraphQLStrategy`, created once per name.
+
+    Names are unique within a schema, therefore the table grows only up to the schema size and entries are never evicted.
+    """
+
+    index: SchemaIndex = attr.ib()
+    hits: int = attr.ib(default=0)
+    misses: int = attr.ib(default=0)
+    _entries: Dict[Tuple[Callable, str], Any] = attr.ib(factory=dict)
+
+    def _get(self, make: Callable, name: str, source: Any) -> Any:
+        key = (make, name)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            entry = self._entries[key] = make(source)
+        else:
+            self.hits += 1
+        return entry
+
+    def field(self, name: str) -> Callable[[FieldNodeInput], graphql.FieldNode]:
+        return self._get(field, name, self.index.names[name])
+
+    def argument(self, name: str) -> Callable[[graphql.ValueNode], graphql.ArgumentNode]:
+        return self._get(argument, name, self.index.names[name])
+
+    def object_field(self, name: str) -> Callable[[graphql.ValueNode], graphql.ObjectFieldNode]:
+        return self._get(object_field, name, self.index.names[name])
+
+    def inline_fragment(self, type_name: str) -> Callable[[SelectionNodes], graphql.InlineFragmentNode]:
+        return self._get(inline_fragment, type_name, self.index.named_types[type_name])
+
+    def enum_values(self, type_: graphql.GraphQLEnumType) -> Tuple[graphql.EnumValueNode, ...]:
+        """Value nodes for all values of the given enum type."""
+        return self._get(enum_values, type_.name, type_)
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(hits=self.hits, misses=self.misses, evictions=0, size=len(self._entries), maxsize=None)
@@ -0,0 +1,399 @@
+"""Precomputed information about a schema, that is shared by all strategies built for it."""
+import weakref
+from typing import AbstractSet, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import attr
+import graphql
+
+from ..types import Field
+from .primitives import unsupported_scalar_message
+
+# Field name, field definition, and the underlying named type of the field
+FieldEntry = Tuple[str, graphql.GraphQLField, graphql.GraphQLNamedType]
+InputFieldEntry = Tuple[str, graphql.GraphQLInputField, graphql.GraphQLNamedType]
+# Types that require a selection set
+COMPOSITE_TYPES = (graphql.GraphQLObjectType, graphql.GraphQLInterfaceType, graphql.GraphQLUnionType)
+
+
+@attr.s(slots=True)
+class SchemaIndex:
+    """Information that otherwise would be repeatedly extracted from `graphql-core` objects.
+
+    It doesn't reference the schema itself, so the schema could be garbage collected together with its index.
+
+    All fields are keyed by type names:
+      - `fields` - sorted field entries of object & interface types
+      - `input_fields` - sorted field entries of input object types
+      - `type_names` - string representation of each field type, e.g. `NonNullListString` for `[String]!`.
+        Types are equal if their names are equal, therefore it replaces `graphql.is_equal_type`
+      - `implementations` - objects implementing each interface
+      - `ambiguous_fields` - fields that are defined with different types on different types. Only they can
+        conflict when types are queried together via inline fragments
+      - `min_depths` - the minimum number of nested selection sets needed to select any field from a composite type.
+        Types that can't be selected in a finite number of levels are absent
+      - `min_field_nodes` - the minimum number of nodes in a selection of fields of an object or interface type
+      - `min_nodes` - the minimum number of nodes in a selection set of a composite type. Unlike `min_field_nodes`,
+        it includes inline fragments, which are always generated for unions and interfaces with implementations
+      - `alias_types` - composite types, selections of which may contain fields with conflicting arguments. Such
+        fields are possible only if their parents are merged, which happens only within inline fragments. Therefore,
+        a type is included only if a union or an interface with implementations is reachable from it, and a field
+        with arguments is reachable from that union or interface
+
+    If the index is built for a set of supported scalars, then everything that can't be generated is pruned:
+      - `excluded_inputs` - reasons why values of input types can't be generated. It includes unsupported scalars and
+        input objects with such required fields. Required lists don't count, as they could be empty. Optional input
+        fields of these types are removed from `input_fields`
+      - `excluded_fields` - reasons why fields of object & interface types can't be generated, keyed by type names and
+        then by field names. These are fields with required arguments of excluded input types and fields of composite
+        types, that have no fields left. They are removed from `fields`, so they are never selected
+
+    Besides, it holds AST nodes for names, that are shared by all generated documents:
+      - `names` - `NameNode` for every type, field, argument and input field name
+      - `named_types` - `NamedTypeNode` for every object type, used as type conditions of inline fragments
+
+    Sharing them is safe, as generated documents are never mutated in a way that affects names. Conflicting fields get
+    aliases via `aliases.add_aliases`, which copies aliased fields with a new `alias` node, and
+    `add_fragment_aliases`, which assigns a precomputed `NameNode` to the `alias` attribute of a `FieldNode` created
+    on the same draw. Their `name` nodes are only read. Code that processes generated documents should not modify name
+    nodes in place either.
+    """
+
+    fields: Dict[str, Tuple[FieldEntry, ...]] = attr.ib(factory=dict)
+    input_fields: Dict[str, Tuple[InputFieldEntry, ...]] = attr.ib(factory=dict)
+    type_names: Dict[str, Dict[str, str]] = attr.ib(factory=dict)
+    implementations: Dict[str, Tuple[graphql.GraphQLObjectType, ...]] = attr.ib(factory=dict)
+    ambiguous_fields: Dict[str, Dict[str, str]] = attr.ib(factory=dict)
+    min_depths: Dict[str, int] = attr.ib(factory=dict)
+    min_field_nodes: Dict[str, int] = attr.ib(factory=dict)
+    min_nodes: Dict[str, int] = attr.ib(factory=dict)
+    alias_types: Set[str] = attr.ib(factory=set)
+    excluded_inputs: Dict[str, str] = attr.ib(factory=dict)
+    excluded_fields: Dict[str, Dict[str, str]] = attr.ib(factory=dict)
+    names: Dict[str, graphql.NameNode] = attr.ib(factory=dict)
+    named_types: Dict[str, graphql.NamedTypeNode] = attr.ib(factory=dict)
+
+    @classmethod
+    def from_schema(cls, schema: graphql.GraphQLSchema, scalars: Optional[AbstractSet[str]] = None) -> "SchemaIndex":
+        """Build an index for the given schema.
+
+        :param scalars: Names of scalar types that could be generated. `None` means all of them, and nothing is pruned.
+        """
+        index = cls()
+        # Type names of fields with the same name across all types
+        seen_types: Dict[str, set] = {}
+        for name, type_ in schema.type_map.items():
+            index._add_names(type_)
+            if isinstance(type_, (graphql.GraphQLObjectType, graphql.GraphQLInterfaceType)):
+                index.fields[name] = tuple(
+                    (field_name, field, unwrap_field_type(field)) for field_name, field in sorted(type_.fields.items())
+                )
+                type_names = {field_name: make_type_name(field.type) for field_name, field in type_.fields.items()}
+                index.type_names[name] = type_names
+                for field_name, type_name in type_names.items():
+                    seen_types.setdefault(field_name, set()).add(type_name)
+            elif isinstance(type_, graphql.GraphQLInputObjectType):
+                index.input_fields[name] = tuple(
+                    (field_name, field, unwrap_field_type(field)) for field_name, field in sorted(type_.fields.items())
+                )
+            if isinstance(type_, graphql.GraphQLInterfaceType):
+                index.implementations[name] = tuple(schema.get_implementations(type_).objects)
+        ambiguous = {field_name for field_name, types in seen_types.items() if len(types) > 1}
+        for name, type_ in schema.type_map.items():
+            if isinstance(type_, (graphql.GraphQLObjectType, graphql.GraphQLInterfaceType)):
+                type_names = index.type_names[name]
+                index.ambiguous_fields[name] = {
+                    field_name: type_names[field_name] for field_name in type_names if field_name in ambiguous
+                }
+        if scalars is not None:
+            index._exclude_inputs(schema, scalars)
+            index._exclude_arguments()
+        index._compute_min_depths(schema)
+        if scalars is not None:
+            index._exclude_empty_types()
+        index._compute_min_nodes(schema)
+        index._compute_alias_types(schema)
+        return index
+
+    def _add_names(self, type_: graphql.GraphQLNamedType) -> None:
+        names = [type_.name]
+        if isinstance(type_, (graphql.GraphQLObjectType, graphql.GraphQLInterfaceType)):
+            for field_name, field in type_.fields.items():
+                names.append(field_name)
+                names.extend(field.args)
+        elif isinstance(type_, graphql.GraphQLInputObjectType):
+            names.extend(type_.fields)
+        for name in names:
+            if name not in self.names:
+                self.names[name] = graphql.NameNode(value=name)
+        if isinstance(type_, graphql.GraphQLObjectType):
+            self.named_types[type_.name] = graphql.NamedTypeNode(name=self.names[type_.name])
+
+    def _exclude_inputs(self, schema: graphql.GraphQLSchema, scalars: AbstractSet[str]) -> None:
+        for name, type_ in schema.type_map.items():
+            if isinstance(type_, graphql.GraphQLScalarType) and name not in scalars:
+                self.excluded_inputs[name] = unsupported_scalar_message(name)
+        # Only required fields that can't be empty lists have to be generated
+        required = {
+            name: [
+                entry[2].name
+                for entry in entries
+                if graphql.is_required_input_field(entry[1]) and _needs_named_value(entry[1].type)
+            ]
+            for name, entries in self.input_fields.items()
+        }
+        # Required fields may form cycles, therefore input objects are considered impossible to generate until all
+        # their required fields are known to be possible to generate. Iterate until a fixed point is reached
+        pending = set(required)
+        changed = True
+        while changed:
+            changed = False
+            for name in sorted(pending):
+                if not any(
+                    field_type in pending or field_type in self.excluded_inputs for field_type in required[name]
+                ):
+                    pending.remove(name)
+                    changed = True
+        # Remaining types either depend on excluded types, and their reason is propagated, or form cycles
+        changed = True
+        while changed:
+            changed = False
+            for name in sorted(pending):
+                for field_type in required[name]:
+                    if field_type in self.excluded_inputs:
+                        self.excluded_inputs[name] = self.excluded_inputs[field_type]
+                        pending.remove(name)
+                        changed = True
+                        break
+        for name in pending:
+            self.excluded_inputs[name] = f"Required fields of the `{name}` input type reference each other in a cycle"
+        for name, entries in self.input_fields.items():
+            # Optional fields that can't be generated are skipped
+            self.input_fields[name] = tuple(
+                entry
+                for entry in entries
+                if entry[2].name not in self.excluded_inputs or graphql.is_required_input_field(entry[1])
+            )
+
+    def _exclude_arguments(self) -> None:
+        for name, entries in self.fields.items():
+            excluded = self.excluded_fields.setdefault(name, {})
+            for field_name, field, _ in entries:
+                for argument_name, argument in field.args.items():
+                    argument_type = graphql.get_named_type(argument.type)
+                    if _needs_named_value(argument.type) and argument_type.name in self.excluded_inputs:
+                        excluded[field_name] = (
+                            f"The `{argument_name}` argument can't be generated. "
+                            f"{self.excluded_inputs[argument_type.name]}"
+                        )
+                        break
+            self.fields[name] = tuple(entry for entry in entries if entry[0] not in excluded)
+
+    def _exclude_empty_types(self) -> None:
+        # Fields of types without a finite `min_depth` can't be selected, e.g. all fields of their type are excluded.
+        # Excluding such fields doesn't change `min_depths`, as they don't have a depth themselves.
+        # Interfaces without fields are still selected via inline fragments on their implementations
+        for name, entries in self.fields.items():
+            excluded = self.excluded_fields[name]
+            for field_name, _, field_type in entries:
+                if (
+                    isinstance(field_type, COMPOSITE_TYPES)
+                    and field_type.name not in self.min_depths
+                    and not any(impl.name in self.min_depths for impl in self.implementations.get(field_type.name, ()))
+                ):
+                    excluded[field_name] = f"The `{field_type.name}` type has no fields that could be generated"
+            self.fields[name] = tuple(entry for entry in entries if entry[0] not in excluded)
+
+    def _compute_min_depths(self, schema: graphql.GraphQLSchema) -> None:
+        # Iterate until a fixed point is reached, as types may reference each other in cycles
+        changed = True
+        while changed:
+            changed = False
+            for name, type_ in schema.type_map.items():
+                candidates: List[Optional[int]]
+                if isinstance(type_, graphql.GraphQLUnionType):
+                    candidates = [self.min_depths.get(member.name) for member in type_.types]
+                elif name in self.fields:
+                    candidates = [self.field_depth(entry) for entry in self.fields[name]]
+                else:
+                    continue
+                changed |= _update_minimum(self.min_depths, name, candidates)
+
+    def _compute_min_nodes(self, schema: graphql.GraphQLSchema) -> None:
+        changed = True
+        while changed:
+            changed = False
+            for name, type_ in schema.type_map.items():
+                if name in self.fields:
+                    costs = [self.field_cost(entry) for entry in self.fields[name]]
+                    changed |= _update_minimum(self.min_field_nodes, name, costs)
+                    field_nodes = self.min_field_nodes.get(name)
+                    implementations = self.implementations.get(name)
+                    if field_nodes is None:
+                        continue
+                    if implementations:
+                        # At least one inline fragment is generated
+                        fragment_nodes = self._min_fragment_nodes(implementations)
+                        nodes = None if fragment_nodes is None else field_nodes + fragment_nodes
+                    else:
+                        nodes = field_nodes
+                elif isinstance(type_, graphql.GraphQLUnionType):
+                    nodes = self._min_fragment_nodes(type_.types)
+                else:
+                    continue
+                changed |= _update_minimum(self.min_nodes, name, [nodes])
+
+    def _compute_alias_types(self, schema: graphql.GraphQLSchema) -> None:
+        children: Dict[str, Set[str]] = {}
+        with_fragments = set()
+        for name, type_ in schema.type_map.items():
+            if isinstance(type_, graphql.GraphQLUnionType):
+                children[name] = {member.name for member in type_.types}
+                with_fragments.add(name)
+            elif name in self.fields:
+                children[name] = {entry[2].name for entry in self.fields[name] if isinstance(entry[2], COMPOSITE_TYPES)}
+                implementations = self.implementations.get(name)
+                if implementations:
+                    children[name].update(impl.name for impl in implementations)
+                    with_fragments.add(name)
+        with_arguments = {name for name, entries in self.fields.items() if any(entry[1].args for entry in entries)}
+        conflicting = with_fragments & _reaching(with_arguments, children)
+        self.alias_types = _reaching(conflicting, children)
+
+    def _min_fragment_nodes(self, types: Iterable[graphql.GraphQLObjectType]) -> Optional[int]:
+        return min((self.fragment_cost(type_) for type_ in types if type_.name in self.min_field_nodes), default=None)
+
+    def field_cost(self, entry: FieldEntry) -> Optional[int]:
+        """The minimum number of nodes needed to select the given field, including the field itself."""
+        field_type = entry[2]
+        if not isinstance(field_type, COMPOSITE_TYPES):
+            return 1
+        nodes = self.min_nodes.get(field_type.name)
+        if nodes is None:
+            return None
+        return nodes + 1
+
+    def fragment_cost(self, type_: graphql.GraphQLObjectType) -> int:
+        """The minimum number of nodes in an inline fragment on the given type, including the fragment itself."""
+        return self.min_field_nodes[type_.name] + 1
+
+    def field_depth(self, entry: FieldEntry) -> Optional[int]:
+        """The minimum number of selection set levels needed to select the given field, including its own level."""
+        field_type = entry[2]
+        if not isinstance(field_type, COMPOSITE_TYPES):
+            return 1
+        depth = self.min_depths.get(field_type.name)
+        if depth is None:
+            return None
+        return depth + 1
+
+    def fields_within_depth(self, entries: Iterable[FieldEntry], depth: Optional[int]) -> List[FieldEntry]:
+        """Field entries that could be selected within the given number of levels. `None` means no limit."""
+        if depth is None:
+            return list(entries)
+        selected = []
+        for entry in entries:
+            field_depth = self.field_depth(entry)
+            if field_depth is not None and field_depth <= depth:
+                selected.append(entry)
+        return selected
+
+    def fits_depth(self, type_: graphql.GraphQLNamedType, depth: Optional[int]) -> bool:
+        """Whether any fields of the given composite type could be selected within the given number of levels."""
+        if depth is None:
+            return type_.name in self.min_depths
+        min_depth = self.min_depths.get(type_.name)
+        return min_depth is not None and min_depth <= depth
+
+    def fragment_aliases(self, type_names: Iterable[str]) -> List[Dict[str, graphql.NameNode]]:
+        """Aliases for fields of inline fragments on given types, that may conflict with preceding fragments.
+
+        A field gets an alias if it is defined with a different type than the first field with the same name.
+        """
+        seen: Dict[str, str] = {}
+        result = []
+        for type_name in type_names:
+            aliases = {}
+            for field_name, field_type in self.ambiguous_fields[type_name].items():
+                if seen.setdefault(field_name, field_type) != field_type:
+                    aliases[field_name] = graphql.NameNode(value=f"{field_name}_{field_type}")
+            result.append(aliases)
+        return result
+
+    def can_generate_input(self, type_: graphql.GraphQLInputType) -> bool:
+        """Whether values of the given input type could be generated."""
+        return graphql.get_named_type(type_).name not in self.excluded_inputs
+
+    def exclusions(self, type_name: str, names: Optional[Iterable[str]] = None) -> List[str]:
+        """Human-readable reasons why fields of the given type are excluded, restricted to given names if any."""
+        excluded = self.excluded_fields.get(type_name, {})
+        selected = sorted(excluded) if names is None else sorted(set(names) & set(excluded))
+        return [f"`{type_name}.{name}`: {excluded[name]}" for name in selected]
+
+    def select_fields(self, type_name: str, names: Iterable[str]) -> List[FieldEntry]:
+        """Field entries of the given type, restricted to given names."""
+        names = set(names)
+        return [entry for entry in self.fields[type_name] if entry[0] in names]
+
+
+# Indexes of each schema are keyed by the supported scalars
+_INDEXES: "weakref.WeakKeyDictionary[graphql.GraphQLSchema, Dict[Optional[FrozenSet[str]], SchemaIndex]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_index(schema: graphql.GraphQLSchema, scalars: Optional[AbstractSet[str]] = None) -> SchemaIndex:
+    """Get an index for the given schema, building it on the first call.
+
+    :param scalars: Names of scalar types that could be generated, see `SchemaIndex.from_schema`.
+    """
+    key = None if scalars is None else frozenset(scalars)
+    indexes = _INDEXES.setdefault(schema, {})
+    index = indexes.get(key)
+    if index is None:
+        index = SchemaIndex.from_schema(schema, key)
+        indexes[key] = index
+    return index
+
+
+def _update_minimum(values: Dict[str, int], name: str, candidates: Iterable[Optional[int]]) -> bool:
+    """Store the minimum of known candidates if it is lower than the current value."""
+    minimum = min((candidate for candidate in candidates if candidate is not None), default=None)
+    if minimum is not None and (name not in values or minimum < values[name]):
+        values[name] = minimum
+        return True
+    return False
+
+
+def _reaching(targets: Set[str], children: Dict[str, Set[str]]) -> Set[str]:
+    """Names of all types from which any of the target types is reachable, including targets themselves."""
+    reaching = set(targets)
+    changed = True
+    while changed:
+        changed = False
+        for name, names in children.items():
+            if name not in reaching and not names.isdisjoint(reaching):
+                reaching.add(name)
+                changed = True
+    return reaching
+
+
+def unwrap_field_type(field: Field) -> graphql.GraphQLNamedType:
+    """Get the underlying field type which is not wrapped."""
+    type_ = field.type
+    while isinstance(type_, graphql.GraphQLWrappingType):
+        type_ = type_.of_type
+    return type_
+
+
+def _needs_named_value(type_: graphql.GraphQLInputType) -> bool:
+    """Whether a non-null value of this type always contains a value of its named type, i.e. it is not a list."""
+    return isinstance(type_, graphql.GraphQLNonNull) and not isinstance(type_.of_type, graphql.GraphQLList)
+
+
+def make_type_name(type_: graphql.GraphQLType) -> str:
+    """Create a name for a type."""
+    name = ""
+    while isinstance(type_, graphql.GraphQLWrappingType):
+        name += type_.__class__.__name__.replace("GraphQL", "")
+        type_ = type_.of_type
+    return f"{name}{type_.name}"
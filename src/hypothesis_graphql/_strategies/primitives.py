@@ -1,5 +1,4 @@
 """Strategies for simple types like scalars or enums."""
-from functools import lru_cache
 from typing import Optional, Tuple, Type, TypeVar, Union
 
 import graphql
@@ -28,7 +27,6 @@ BOOLEAN_STRATEGY = st.booleans().map(nodes.Boolean)
 NULL_STRATEGY = st.just(nodes.Null)
 
 
-@lru_cache(maxsize=16)
 def scalar(
     type_name: str, nullable: bool = True, default: Optional[graphql.ValueNode] = None
 ) -> st.SearchStrategy[ScalarValueNode]:
@@ -42,7 +40,11 @@ def scalar(
         return id_(nullable, default)
     if type_name == "Boolean":
         return boolean(nullable, default)
-    raise InvalidArgument(
+    raise InvalidArgument(unsupported_scalar_message(type_name))
+
+
+def unsupported_scalar_message(type_name: str) -> str:
+    return (
         f"Scalar {type_name!r} is not supported. "
         "Provide a Hypothesis strategy via the `custom_scalars` argument to generate it."
     )
@@ -99,11 +101,10 @@ def maybe_default(
     return strategy
 
 
-@lru_cache(maxsize=64)
 def enum(
-    values: Tuple[str], nullable: bool = True, default: Optional[graphql.ValueNode] = None
+    values: Tuple[graphql.EnumValueNode, ...], nullable: bool = True, default: Optional[graphql.ValueNode] = None
 ) -> st.SearchStrategy[graphql.EnumValueNode]:
-    return maybe_default(maybe_null(st.sampled_from(values).map(nodes.Enum), nullable), default=default)
+    return maybe_default(maybe_null(st.sampled_from(values), nullable), default=default)
 
 
 def list_(
@@ -1,38 +1,79 @@
 # pylint: disable=unused-import
+import inspect
 import operator
-from functools import reduce, wraps
-from operator import or_
-from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+import threading
+import weakref
+from functools import partial, wraps
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+    overload,
+)
 
 import attr
 import graphql
-from graphql import is_equal_type
 from hypothesis import strategies as st
 from hypothesis.errors import InvalidArgument
 from hypothesis.strategies._internal.utils import cacheable
 
-from .. import nodes
-from ..types import AstPrinter, CustomScalarStrategies, Field, InputTypeNode, InterfaceOrObject, SelectionNodes
+from .. import nodes, printers
+from ..cache import CacheInfo, LRUCache
+from ..cost import CostModel
+from ..types import (
+    AstPrinter,
+    CustomScalarStrategies,
+    InputTypeNode,
+    InterfaceOrObject,
+    OperationWithVariables,
+    Schema,
+    SelectionNodes,
+)
 from . import factories, primitives, validation
+from .aliases import add_aliases, map_selections
 from .ast import make_mutation, make_query
 from .containers import flatten
+from .index import FieldEntry, InputFieldEntry, SchemaIndex, get_index, make_type_name
+from .variables import ExtractedVariables, extract_variables
+
+if TYPE_CHECKING:
+    # Not needed at runtime, as it is used only in string annotations
+    from typing_extensions import Literal
 
 BY_NAME = operator.attrgetter("name")
 EMPTY_LISTS_STRATEGY = st.builds(list)
 BUILT_IN_SCALAR_TYPE_NAMES = {"Int", "Float", "String", "ID", "Boolean"}
+# Drawing a few dozens of operations from schemas in the bundled corpus fills up to ~2k entries
+DEFAULT_CACHE_SIZE = 4096
+Entry = TypeVar("Entry", FieldEntry, InputFieldEntry)
+T = TypeVar("T")
+
 
+def instance_cache(key_func: Callable, cache: str = "_cache") -> Callable:
+    """Cache results of a `GraphQLStrategy` method in the given cache attribute."""
+    get_cache = operator.attrgetter(cache)
 
-def instance_cache(key_func: Callable) -> Callable:
     def decorator(method: Callable) -> Callable:
+        name = method.__name__
+
         @wraps(method)
         def wrapped(self: "GraphQLStrategy", *args: Any, **kwargs: Any) -> st.SearchStrategy:
-            key = key_func(*args, **kwargs)
-            memo = self._cache.setdefault(method.__name__, {})
-            cached = memo.get(key)
+            key = (name, key_func(*args, **kwargs))
+            storage = get_cache(self)
+            cached = storage.get(key)
             if cached is not None:
                 return cached
             result = method(self, *args, **kwargs)
-            memo[key] = result
+            storage.set(key, result)
             return result
 
         return wrapped
@@ -46,10 +87,66 @@ class GraphQLStrategy:
 
     schema: graphql.GraphQLSchema = attr.ib()
     custom_scalars: CustomScalarStrategies = attr.ib(factory=dict)
-    # As the schema is assumed to be immutable, there are a few strategy caches possible for internal components
-    # This is a per-method cache without limits as they are proportionate to the schema size
-    _cache: Dict[str, Dict] = attr.ib(factory=dict)
+    # As the schema is assumed to be immutable, there are a few strategy caches possible for internal components.
+    # Most of the entries are proportionate to the schema size. However, strategies for fragments are keyed by subsets
+    # of types and their number may grow for schemas with large unions, therefore the cache is bounded by default.
+    # `None` means no limit. Strategies for input values are not counted, see `_value_cache`
+    cache_size: Optional[int] = attr.ib(default=DEFAULT_CACHE_SIZE)
+    # Limits for the size of generated documents, `None` means no limit:
+    #   - `max_depth` - the maximum number of nested selection sets
+    #   - `max_fields_per_selection` - the maximum number of fields or inline fragments selected from a single type
+    #   - `max_nodes` - the maximum total number of fields and inline fragments in a document
+    max_depth: Optional[int] = attr.ib(default=None)
+    max_fields_per_selection: Optional[int] = attr.ib(default=None)
+    max_nodes: Optional[int] = attr.ib(default=None)
+    # Operations with a higher cost according to `cost_model` are not generated
+    cost_model: CostModel = attr.ib(factory=CostModel)
+    max_cost: Optional[int] = attr.ib(default=None)
+    _cache: LRUCache[Any] = attr.ib(init=False)
+    # Strategies for input values, keyed by input types and default values. Their number is proportional to the schema
+    # size, and they are reused by most fields, therefore they are not evicted by other strategies
+    _value_cache: LRUCache[Any] = attr.ib(init=False, factory=LRUCache)
+    index: SchemaIndex = attr.ib(init=False)
+    _factories: factories.FactoryTable = attr.ib(init=False)
+    # The number of nodes that generation aims for, see `spend_budget`
+    _node_budget: Optional[int] = attr.ib(init=False)
+
+    @_cache.default
+    def _make_cache(self) -> LRUCache[Any]:
+        return LRUCache(self.cache_size)
+
+    @index.default
+    def _get_index(self) -> SchemaIndex:
+        # Fields and input types that can't be generated with the given custom scalars are pruned
+        return get_index(self.schema, BUILT_IN_SCALAR_TYPE_NAMES.union(self.custom_scalars))
+
+    @_factories.default
+    def _make_factories(self) -> factories.FactoryTable:
+        return factories.FactoryTable(self.index)
 
+    @_node_budget.default
+    def _make_node_budget(self) -> Optional[int]:
+        budgets = []
+        if self.max_nodes is not None:
+            budgets.append(self.max_nodes)
+        if self.max_cost is not None and self.cost_model.min_weight() >= 1:
+            # Every field costs at least 1, therefore operations within `max_cost` don't have more fields than that
+            budgets.append(self.max_cost)
+        return min(budgets, default=None)
+
+    def cache_info(self) -> CacheInfo:
+        """Statistics of the strategy cache."""
+        return self._cache.info()
+
+    def value_cache_info(self) -> CacheInfo:
+        """Statistics of the unbounded cache of strategies for input values."""
+        return self._value_cache.info()
+
+    def factory_info(self) -> CacheInfo:
+        """Statistics of the node factory table."""
+        return self._factories.info()
+
+    @instance_cache(lambda type_, default=None: (make_type_name(type_), default), cache="_value_cache")
     def values(
         self, type_: graphql.GraphQLInputType, default: Optional[graphql.ValueNode] = None
     ) -> st.SearchStrategy[InputTypeNode]:
@@ -72,8 +169,7 @@ class GraphQLStrategy:
                 return primitives.custom(self.custom_scalars[type_name], nullable, default=default)
             return primitives.scalar(type_name, nullable, default=default)
         if isinstance(type_, graphql.GraphQLEnumType):
-            values = tuple(type_.values)
-            return primitives.enum(values, nullable, default=default)
+            return primitives.enum(self._factories.enum_values(type_), nullable, default=default)
         # Types with children
         if isinstance(type_, graphql.GraphQLList):
             return self.lists(type_, nullable, default=default)
@@ -81,177 +177,379 @@ class GraphQLStrategy:
             return self.objects(type_, nullable)
         raise TypeError(f"Type {type_.__class__.__name__} is not supported.")
 
-    @instance_cache(lambda type_, nullable=True, default=None: (make_type_name(type_), nullable, default))
     def lists(
         self, type_: graphql.GraphQLList, nullable: bool = True, default: Optional[graphql.ValueNode] = None
     ) -> st.SearchStrategy[graphql.ListValueNode]:
         """Generate a `graphql.ListValueNode`."""
-        strategy = st.lists(self.values(type_.of_type))
+        if self.index.can_generate_input(type_.of_type):
+            strategy = st.lists(self.values(type_.of_type))
+        else:
+            # Items that are not possible to generate, e.g. required lists of unsupported scalars, are always empty
+            strategy = EMPTY_LISTS_STRATEGY
         return primitives.list_(strategy, nullable, default=default)
 
-    @instance_cache(lambda type_, nullable=True: (type_.name, nullable))
+    @instance_cache(lambda type_, nullable=True: (type_.name, nullable), cache="_value_cache")
     def objects(
         self, type_: graphql.GraphQLInputObjectType, nullable: bool = True
     ) -> st.SearchStrategy[graphql.ObjectValueNode]:
         """Generate a `graphql.ObjectValueNode`."""
-        fields = {
-            name: field
-            for name, field in type_.fields.items()
-            # Generate optional fields that are possible to generate and all required fields.
-            # If a required field is not possible to generate, then it will fail deeper anyway
-            if self.can_generate_field(field) or graphql.is_required_input_field(field)
-        }
+        # Optional fields that are not possible to generate are already excluded by the index
+        fields = self.index.input_fields[type_.name]
         strategy = subset_of_fields(fields, force_required=True).flatmap(self.lists_of_object_fields)
         return primitives.maybe_null(strategy.map(nodes.Object), nullable)
 
-    def can_generate_field(self, field: graphql.GraphQLInputField) -> bool:
-        """Whether it is possible to generate values for the given field."""
-        type_ = unwrap_field_type(field)
-        return (
-            # Can generate any non-scalar
-            not isinstance(type_, graphql.GraphQLScalarType)
-            # Default scalars
-            or type_.name in BUILT_IN_SCALAR_TYPE_NAMES
-            # User-provided scalars
-            or type_.name in self.custom_scalars
-        )
-
-    def lists_of_object_fields(
-        self, items: List[Tuple[str, graphql.GraphQLInputField]]
-    ) -> st.SearchStrategy[List[graphql.ObjectFieldNode]]:
+    def lists_of_object_fields(self, items: List[InputFieldEntry]) -> st.SearchStrategy[List[graphql.ObjectFieldNode]]:
         return st.tuples(
             *(
-                self.values(field.type, field.ast_node.default_value if field.ast_node is not None else None).map(
-                    factories.object_field(name)
-                )
-                for name, field in items
+                self.values(field.type, get_default_value(field)).map(self._factories.object_field(name))
+                for name, field, _ in items
             )
         ).map(list)
 
-    @instance_cache(lambda interface, implementations: (interface.name, tuple(impl.name for impl in implementations)))
+    @instance_cache(
+        lambda interface, implementations, depth=None: (
+            interface.name,
+            tuple(impl.name for impl in implementations),
+            depth,
+        )
+    )
     def interfaces(
-        self, interface: graphql.GraphQLInterfaceType, implementations: List[InterfaceOrObject]
+        self,
+        interface: graphql.GraphQLInterfaceType,
+        implementations: List[InterfaceOrObject],
+        depth: Optional[int] = None,
     ) -> st.SearchStrategy[SelectionNodes]:
         """Build query for GraphQL interface type."""
-        # If there are implementations that have fields with the same name but different types
-        # then the resulting query should not have these fields simultaneously
-        strategies, overlapping_fields = self.collect_fragment_strategies(implementations)
-        if overlapping_fields:
-            return compose_interfaces_with_filter(self.selections(interface), strategies, self.schema.type_map)
-        # No overlapping - safe to choose any subset of fields within the interface itself and any fragment
-        return st.tuples(self.selections(interface), *strategies).map(flatten)  # type: ignore
-
-    @instance_cache(lambda items: tuple(item.name for item in items))
-    def inline_fragments(self, items: List[graphql.GraphQLObjectType]) -> st.SearchStrategy[SelectionNodes]:
+        strategies = self.collect_fragment_strategies(implementations, depth)
+        max_size = None
+        if self.max_fields_per_selection is not None:
+            # Fields of the interface itself and inline fragments are in the same selection set
+            max_size = self.max_fields_per_selection - len(implementations)
+        fields = self.selections(interface, depth=depth, max_size=max_size)
+        return st.tuples(fields, *strategies).map(flatten)  # type: ignore
+
+    @instance_cache(lambda items, depth=None: (tuple(item.name for item in items), depth))
+    def inline_fragments(
+        self, items: List[graphql.GraphQLObjectType], depth: Optional[int] = None
+    ) -> st.SearchStrategy[SelectionNodes]:
         """Create inline fragment nodes for each given item."""
-        # If there are implementations that have fields with the same name but different types
-        # then the resulting query should not have these fields simultaneously
-        strategies, overlapping_fields = self.collect_fragment_strategies(items)
-        if overlapping_fields:
-            return compose_interfaces_with_filter(EMPTY_LISTS_STRATEGY, strategies, self.schema.type_map)
-        # No overlapping - safe to choose any subset of fields within the interface itself and any fragment
-        return st.tuples(*(self.inline_fragment(type_) for type_ in items)).map(list)
-
-    @instance_cache(lambda type_: type_.name)
-    def inline_fragment(self, type_: graphql.GraphQLObjectType) -> st.SearchStrategy[graphql.InlineFragmentNode]:
+        return st.tuples(*self.collect_fragment_strategies(items, depth)).map(list)
+
+    @instance_cache(lambda type_, depth=None: (type_.name, depth))
+    def inline_fragment(
+        self, type_: graphql.GraphQLObjectType, depth: Optional[int] = None
+    ) -> st.SearchStrategy[graphql.InlineFragmentNode]:
         """Build `InlineFragmentNode` for the given type."""
-        return self.selections(type_).map(factories.inline_fragment(type_.name))
+        return self.selections(type_, depth=depth).map(self._factories.inline_fragment(type_.name))
+
+    @instance_cache(lambda type_, fields=None: (type_.name, fields))
+    def root_selections(
+        self,
+        object_type: graphql.GraphQLObjectType,
+        fields: Optional[Tuple[str, ...]] = None,
+    ) -> st.SearchStrategy[List[graphql.FieldNode]]:
+        """Generate top-level fields of an operation within all configured limits."""
+        self.validate_selectable(object_type, fields)
+        strategy = self.selections(object_type, fields=fields, depth=self.max_depth)
+        # Aliases are resolved once the whole operation is generated, and only for fields that may need them
+        alias_fields = frozenset(
+            name
+            for name, _, field_type in self.index.fields[object_type.name]
+            if field_type.name in self.index.alias_types
+        )
+        if alias_fields:
+            strategy = strategy.map(partial(add_aliases, fields=alias_fields))
+        if self._node_budget is not None:
+            # Top-level fields are not reserved by any parent, see `spend_budget`
+            budget = self._node_budget - self.index.min_field_nodes.get(object_type.name, 0)
+            strategy = with_budget(strategy, budget)
+        if self.max_nodes is not None:
+            max_nodes = self.max_nodes
+            # The budget is a soft limit during generation, the filter makes it strict
+            strategy = strategy.filter(lambda selections: count_nodes(selections) <= max_nodes)
+        if self.max_cost is not None:
+            max_cost = self.max_cost
+            cost_model = self.cost_model
+            schema = self.schema
+            strategy = strategy.filter(
+                lambda selections: cost_model.selections_cost(selections, object_type, schema) <= max_cost
+            )
+        return strategy
 
     @instance_cache(lambda type_, fields=None: (type_.name, fields))
+    def root_variables(
+        self,
+        object_type: graphql.GraphQLObjectType,
+        fields: Optional[Tuple[str, ...]] = None,
+    ) -> st.SearchStrategy[ExtractedVariables]:
+        """Generate top-level fields with arguments passed as variables, together with their definitions and values."""
+        return self.root_selections(object_type, fields=fields).map(
+            partial(extract_variables, parent_type=object_type, schema=self.schema)
+        )
+
+    def validate_selectable(
+        self, object_type: graphql.GraphQLObjectType, fields: Optional[Tuple[str, ...]] = None
+    ) -> None:
+        """Raise an error that explains why, if none of the given top-level fields could be generated."""
+        if not self.can_select(object_type, fields):
+            message = f"No fields of the `{object_type.name}` type could be generated"
+            limits = ", ".join(
+                f"`{name}={value}`"
+                for name, value in (("max_depth", self.max_depth), ("max_cost", self.max_cost))
+                if value is not None
+            )
+            if limits:
+                message += f" with {limits}"
+            exclusions = self.index.exclusions(object_type.name, fields or None)
+            if exclusions:
+                message += ". Excluded fields:\n" + "\n".join(f"  - {exclusion}" for exclusion in exclusions)
+            raise InvalidArgument(message)
+
+    def can_select(self, object_type: graphql.GraphQLObjectType, fields: Optional[Tuple[str, ...]] = None) -> bool:
+        """Whether any of the given top-level fields could be generated within `max_depth` and `max_cost`."""
+        return bool(self._affordable_fields(object_type, self._select_fields(object_type, fields, self.max_depth)))
+
+    @instance_cache(lambda type_, fields=None, depth=None, max_size=None: (type_.name, fields, depth, max_size))
     def selections(
         self,
         object_type: InterfaceOrObject,
         fields: Optional[Tuple[str, ...]] = None,
+        depth: Optional[int] = None,
+        max_size: Optional[int] = None,
     ) -> st.SearchStrategy[List[graphql.FieldNode]]:
-        """Generate a subset of fields defined on the given type."""
+        """Generate a subset of fields defined on the given type.
+
+        `depth` is the number of selection set levels available, including this one. `None` means no limit.
+        `max_size` is the maximum number of fields, `max_fields_per_selection` by default.
+        """
+        subset = self._select_fields(object_type, fields, depth)
+        # minimum 1 field, an empty query is not valid
+        strategy = subset_of_fields(subset, max_size=max_size or self.max_fields_per_selection)
+        if self._node_budget is not None and subset:
+            cheapest = min(subset, key=self._field_cost)
+            strategy = strategy.map(partial(self._spend_on_fields, object_type.name, cheapest))
+        child_depth = None if depth is None else depth - 1
+        return strategy.flatmap(lambda items: self.lists_of_fields(items, child_depth))
+
+    def _select_fields(
+        self, object_type: InterfaceOrObject, fields: Optional[Tuple[str, ...]], depth: Optional[int]
+    ) -> List[FieldEntry]:
         if fields:
-            subset = {name: value for name, value in object_type.fields.items() if name in fields}
+            subset: Sequence[FieldEntry] = self.index.select_fields(object_type.name, fields)
         else:
-            subset = object_type.fields
-        # minimum 1 field, an empty query is not valid
-        return subset_of_fields(subset).flatmap(self.lists_of_fields)
+            subset = self.index.fields[object_type.name]
+        subset = self.index.fields_within_depth(subset, depth)
+        # Fields that are more expensive than the whole operation are not selected. If there are no other fields,
+        # then the selection is rejected by the final check in `root_selections`
+        return self._affordable_fields(object_type, subset) or subset
+
+    def _affordable_fields(self, object_type: InterfaceOrObject, entries: List[FieldEntry]) -> List[FieldEntry]:
+        if self.max_cost is None:
+            return entries
+        weight = self.cost_model.weight
+        return [entry for entry in entries if weight(object_type.name, entry[0]) <= self.max_cost]
 
-    def lists_of_fields(self, items: List[Tuple[str, Field]]) -> st.SearchStrategy[List[graphql.FieldNode]]:
+    def lists_of_fields(
+        self, items: Sequence[FieldEntry], depth: Optional[int] = None
+    ) -> st.SearchStrategy[List[graphql.FieldNode]]:
+        """Generate field nodes for the given field entries.
+
+        `depth` is the number of selection set levels available for their sub-selections.
+        """
         return st.tuples(
             *(
-                st.tuples(self.list_of_arguments(field.args), self.selections_for_type(field)).map(
-                    factories.field(name)
-                )
-                for name, field in items
+                self._field_parts(field, field_type, depth).map(self._factories.field(name))
+                for name, field, field_type in items
             )
         ).map(list)
 
-    @instance_cache(lambda items: tuple(item.name for item in items))
+    def _field_parts(
+        self, field: graphql.GraphQLField, field_type: graphql.GraphQLNamedType, depth: Optional[int]
+    ) -> st.SearchStrategy[Tuple[List[graphql.ArgumentNode], Optional[SelectionNodes]]]:
+        arguments = self.list_of_arguments(field.args)
+        selections = self.selections_for_type(field_type, depth)
+        if (
+            self._node_budget is not None
+            and self.max_cost is not None
+            and any(name in self.cost_model.list_size_arguments for name in field.args)
+        ):
+            # List sizes divide the budget for sub-selections, see `list_sizes`
+            return field_with_budget(arguments, selections)
+        return st.tuples(arguments, selections)
+
+    @instance_cache(lambda items, depth=None: (tuple(item.name for item in items), depth))
     def collect_fragment_strategies(
-        self, items: List[graphql.GraphQLObjectType]
-    ) -> Tuple[List[st.SearchStrategy[graphql.InlineFragmentNode]], bool]:
-        field_types: Dict[str, graphql.GraphQLType] = {}
+        self, items: List[graphql.GraphQLObjectType], depth: Optional[int] = None
+    ) -> List[st.SearchStrategy[graphql.InlineFragmentNode]]:
+        # If there are implementations that have fields with the same name but different types,
+        # then such fields get aliases in all fragments, where they may conflict with the preceding ones
         strategies = []
-        has_overlapping_fields = False
-        for item in items:
-            if not has_overlapping_fields:
-                for name, field in item.fields.items():
-                    if name in field_types:
-                        if not is_equal_type(field.type, field_types[name]):
-                            # There are fields with the same names but different types
-                            has_overlapping_fields = True
-                    else:
-                        field_types[name] = field.type
-            strategies.append(self.inline_fragment(item))
-        return strategies, has_overlapping_fields
+        for item, aliases in zip(items, self.index.fragment_aliases(item.name for item in items)):
+            strategy = self.inline_fragment(item, depth)
+            if aliases:
+                strategy = strategy.map(partial(add_fragment_aliases, aliases))
+            strategies.append(strategy)
+        return strategies
+
+    def _field_cost(self, entry: FieldEntry) -> int:
+        return self.index.field_cost(entry) or 1
 
+    def _spend_on_fields(self, type_name: str, cheapest: FieldEntry, items: List[FieldEntry]) -> List[FieldEntry]:
+        return spend_budget(items, self._field_cost, cheapest, reserved=self.index.min_field_nodes.get(type_name, 0))
+
+    def _spend_on_fragments(
+        self,
+        field_type: graphql.GraphQLNamedType,
+        cheapest: graphql.GraphQLObjectType,
+        items: List[graphql.GraphQLObjectType],
+    ) -> List[graphql.GraphQLObjectType]:
+        # Fields of an interface itself are selected together with fragments. They are reserved here and spent later
+        return spend_budget(
+            items,
+            self.index.fragment_cost,
+            cheapest,
+            reserved=self.index.min_nodes.get(field_type.name, 0),
+            extra=self.index.min_field_nodes.get(field_type.name, 0),
+        )
+
+    # Arguments are owned by the schema, therefore they outlive the cache
+    @instance_cache(id)
     def list_of_arguments(
         self, arguments: Dict[str, graphql.GraphQLArgument]
     ) -> st.SearchStrategy[List[graphql.ArgumentNode]]:
         """Generate a list `graphql.ArgumentNode` for a field."""
         if not arguments:
             return st.just([])
+        strategies = []
+        has_optional = False
+        for name, argument in arguments.items():
+            factory = self._factories.argument(name)
+            if not isinstance(argument.type, graphql.GraphQLNonNull) and not self.index.can_generate_input(
+                argument.type
+            ):
+                # If the type is nullable, then either generate `null` or skip it completely.
+                # Fields with required arguments that can't be generated are excluded by the index
+                strategies.append(st.sampled_from((None, factory(nodes.Null))))
+                has_optional = True
+                continue
+            strategies.append(self.argument_values(name, argument).map(factory))
+        if has_optional:
+            return st.tuples(*strategies).map(skip_missing)
+        return st.tuples(*strategies).map(list)
 
-        @st.composite  # type: ignore
-        def inner(draw: Any) -> List[graphql.ArgumentNode]:
-            args = []
-            for name, argument in arguments.items():
-                default = argument.ast_node.default_value if argument.ast_node is not None else None
-                try:
-                    argument_strategy = self.values(argument.type, default=default)
-                except InvalidArgument:
-                    if not isinstance(argument.type, graphql.GraphQLNonNull):
-                        # If the type is nullable, then either generate `null` or skip it completely
-                        if draw(st.booleans()):
-                            args.append(graphql.ArgumentNode(name=graphql.NameNode(value=name), value=nodes.Null))
-                        continue
-                    raise
-                args.append(draw(argument_strategy.map(factories.argument(name))))
-            return args
-
-        return inner()
+    def argument_values(self, name: str, argument: graphql.GraphQLArgument) -> st.SearchStrategy[InputTypeNode]:
+        """Generate value nodes for the given argument."""
+        default = get_default_value(argument)
+        if self.max_cost is not None and name in self.cost_model.list_size_arguments:
+            type_, nullable = check_nullable(argument.type)
+            if (
+                isinstance(type_, graphql.GraphQLScalarType)
+                and type_.name == "Int"
+                and "Int" not in self.custom_scalars
+            ):
+                # List sizes multiply the cost of selections, larger values would always exceed `max_cost`
+                sizes = list_sizes(self.max_cost).map(nodes.Int)
+                return primitives.maybe_default(primitives.maybe_null(sizes, nullable), default=default)
+        return self.values(argument.type, default=default)
 
     def selections_for_type(
         self,
-        field: graphql.GraphQLField,
+        field_type: graphql.GraphQLNamedType,
+        depth: Optional[int] = None,
     ) -> st.SearchStrategy[Optional[SelectionNodes]]:
-        """Extract proper type from the field and generate field nodes for this type."""
-        field_type = unwrap_field_type(field)
+        """Generate field nodes for the underlying type of a field.
+
+        `depth` is the number of selection set levels available. `None` means no limit.
+        """
         if isinstance(field_type, graphql.GraphQLObjectType):
-            return self.selections(field_type)
+            return self.selections(field_type, depth=depth)
         if isinstance(field_type, graphql.GraphQLInterfaceType):
             # Besides the fields on the interface type, it is possible to generate inline fragments on types that
             # implement this interface type
-            implementations = self.schema.get_implementations(field_type).objects
-            if not implementations:
-                # Shortcut when there are no implementations - take fields from the interface itself
-                return self.selections(field_type)
-            return st.lists(st.sampled_from(implementations), min_size=1, unique_by=BY_NAME).flatmap(
-                lambda impls: self.interfaces(field_type, impls)
+            implementations = [
+                impl for impl in self.index.implementations[field_type.name] if self.index.fits_depth(impl, depth)
+            ]
+            max_size = self.max_fields_per_selection
+            if max_size is not None and self._select_fields(field_type, None, depth):
+                # Fields of the interface and inline fragments share the limit, and at least one field is selected
+                max_size -= 1
+            if not implementations or max_size == 0:
+                # Shortcut when there are no implementations or no room for fragments - take fields from the interface
+                # itself
+                return self.selections(field_type, depth=depth)
+            return self.fragment_types(field_type, implementations, max_size).flatmap(
+                lambda impls: self.interfaces(field_type, impls, depth)
             )
         if isinstance(field_type, graphql.GraphQLUnionType):
             # A union is a set of object types - take a subset of them and generate inline fragments
-            return st.lists(st.sampled_from(field_type.types), min_size=1, unique_by=BY_NAME).flatmap(
-                self.inline_fragments
-            )
+            types = [type_ for type_ in field_type.types if self.index.fits_depth(type_, depth)]
+            return self.fragment_types(field_type, types).flatmap(lambda items: self.inline_fragments(items, depth))
         # Other types don't have fields
         return st.none()
 
+    def fragment_types(
+        self,
+        field_type: graphql.GraphQLNamedType,
+        types: List[graphql.GraphQLObjectType],
+        max_size: Optional[int] = None,
+    ) -> st.SearchStrategy[List[graphql.GraphQLObjectType]]:
+        """Generate a subset of types for inline fragments within a selection of an interface or a union.
+
+        `max_size` is the maximum number of fragments, `max_fields_per_selection` by default.
+        """
+        strategy = st.lists(
+            st.sampled_from(types), min_size=1, max_size=max_size or self.max_fields_per_selection, unique_by=BY_NAME
+        )
+        if self._node_budget is not None and types:
+            cheapest = min(types, key=self.index.fragment_cost)
+            strategy = strategy.map(partial(self._spend_on_fragments, field_type, cheapest))
+        return strategy
+
+
+# Strategies are shared by all calls with the same schema & custom scalars, so their caches are reused.
+# An entry is kept while its `GraphQLStrategy` is referenced by any built strategy, when all of them are garbage
+# collected, the entry is removed, and the schema is released. Therefore, the schema identity is a safe key
+_STRATEGIES: "weakref.WeakValueDictionary[Tuple, GraphQLStrategy]" = weakref.WeakValueDictionary()
+
+
+def get_strategy(
+    schema: graphql.GraphQLSchema,
+    custom_scalars: Optional[CustomScalarStrategies] = None,
+    *,
+    max_depth: Optional[int] = None,
+    max_fields_per_selection: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    cost_model: Optional[CostModel] = None,
+    max_cost: Optional[int] = None,
+    cache_size: Optional[int] = DEFAULT_CACHE_SIZE,
+) -> GraphQLStrategy:
+    """Get a shared `GraphQLStrategy` instance for the given schema, custom scalars, limits and cache size."""
+    cost_model = cost_model or CostModel()
+    key = (
+        id(schema),
+        frozenset(custom_scalars.items()) if custom_scalars else frozenset(),
+        max_depth,
+        max_fields_per_selection,
+        max_nodes,
+        cost_model,
+        max_cost,
+        cache_size,
+    )
+    strategy = _STRATEGIES.get(key)
+    if strategy is None:
+        strategy = GraphQLStrategy(
+            schema,
+            custom_scalars or {},
+            cache_size=cache_size,
+            max_depth=max_depth,
+            max_fields_per_selection=max_fields_per_selection,
+            max_nodes=max_nodes,
+            cost_model=cost_model,
+            max_cost=max_cost,
+        )
+        _STRATEGIES[key] = strategy
+    return strategy
+
 
 def check_nullable(type_: graphql.GraphQLInputType) -> Tuple[graphql.GraphQLInputType, bool]:
     """Get the wrapped type and detect if it is nullable."""
@@ -262,82 +560,221 @@ def check_nullable(type_: graphql.GraphQLInputType) -> Tuple[graphql.GraphQLInpu
     return type_, nullable
 
 
-def unwrap_field_type(field: Field) -> graphql.GraphQLNamedType:
-    """Get the underlying field type which is not wrapped."""
-    type_ = field.type
-    while isinstance(type_, graphql.GraphQLWrappingType):
-        type_ = type_.of_type
-    return type_
+def get_default_value(item: Union[graphql.GraphQLArgument, graphql.GraphQLInputField]) -> Optional[graphql.ValueNode]:
+    """Get the default value of an argument or an input field as an AST node."""
+    if item.ast_node is not None:
+        return item.ast_node.default_value
+    # Schemas built from introspection results have no AST nodes, only Python values
+    if item.default_value is not graphql.Undefined:
+        try:
+            return graphql.ast_from_value(item.default_value, item.type)
+        except (TypeError, ValueError):
+            # Values of custom scalars are not always convertible to AST
+            return None
+    return None
 
 
-def make_type_name(type_: graphql.GraphQLType) -> str:
-    """Create a name for a type."""
-    name = ""
-    while isinstance(type_, graphql.GraphQLWrappingType):
-        name += type_.__class__.__name__.replace("GraphQL", "")
-        type_ = type_.of_type
-    return f"{name}{type_.name}"
+def add_fragment_aliases(
+    aliases: Dict[str, graphql.NameNode], fragment: graphql.InlineFragmentNode
+) -> graphql.InlineFragmentNode:
+    # Generated nodes could be shared between examples, therefore aliased fields are copied together with the fragment
+    def add_alias(node: graphql.SelectionNode) -> graphql.SelectionNode:
+        if not isinstance(node, graphql.FieldNode):
+            return node
+        alias = aliases.get(node.name.value)
+        if alias is None:
+            return node
+        return graphql.FieldNode(
+            alias=alias,
+            name=node.name,
+            arguments=node.arguments,
+            directives=node.directives,
+            selection_set=node.selection_set,
+        )
 
+    original = cast(SelectionNodes, fragment.selection_set.selections)
+    selections = map_selections(original, add_alias)
+    if selections is original:
+        return fragment
+    return graphql.InlineFragmentNode(
+        type_condition=fragment.type_condition,
+        directives=fragment.directives,
+        selection_set=graphql.SelectionSetNode(selections=selections),
+    )
 
-@st.composite  # type: ignore
-def compose_interfaces_with_filter(
-    draw: Any,
-    already_selected: st.SearchStrategy[List],
-    strategies: List[st.SearchStrategy[SelectionNodes]],
-    type_map: Dict[str, graphql.GraphQLType],
-) -> SelectionNodes:
-    selection_nodes = draw(already_selected)
-    # Store what fields are already used and their corresponding types
-    seen: Dict[str, graphql.GraphQLType] = {}
-
-    def mark_seen(frag: graphql.InlineFragmentNode) -> None:
-        # Add this fragment's fields to `seen`
-        fragment_type = type_map[frag.type_condition.name.value]
-        for selected in frag.selection_set.selections:
-            seen.setdefault(selected.name.value, fragment_type.fields[selected.name.value].type)
-
-    def add_alias(frag: graphql.InlineFragmentNode) -> graphql.InlineFragmentNode:
-        # Add an alias for all fields that have the same name with already selected ones but a different type
-        fragment_type = type_map[frag.type_condition.name.value]
-        for selected in frag.selection_set.selections:
-            field_name = selected.name.value
-            if field_name in seen:
-                field_type = fragment_type.fields[field_name].type
-                if not is_equal_type(seen[field_name], field_type):
-                    selected.alias = graphql.NameNode(value=f"{field_name}_{make_type_name(field_type)}")
-        return frag
-
-    for strategy in strategies:
-        fragment = draw(strategy.map(add_alias))
-        selection_nodes.append(fragment)
-        mark_seen(fragment)
-    return selection_nodes
+
+def skip_missing(items: Tuple[Optional[T], ...]) -> List[T]:
+    return [item for item in items if item is not None]
 
 
 def subset_of_fields(
-    fields: Dict[str, graphql.GraphQLInputField], *, force_required: bool = False
-) -> st.SearchStrategy[List[Tuple[str, graphql.GraphQLInputField]]]:
-    """A helper to select a subset of fields."""
+    fields: Sequence[Entry], *, force_required: bool = False, max_size: Optional[int] = None
+) -> st.SearchStrategy[List[Entry]]:
+    """A helper to select a subset of fields from field entries sorted by name."""
     if not fields:
         # The schema is invalid as there should be at least one field
         # But there should not be an internal error because of it
         return EMPTY_LISTS_STRATEGY
-    field_pairs = sorted(fields.items())
     # if we need to always generate required fields, then return them and extend with a subset of optional fields
     if force_required:
-        required, optional = [], {}
-        for name, field in field_pairs:
+        required, optional = [], []
+        for entry in fields:
             # TYPING: `field` is always `GraphQLInputField` as `force_required` equals `True` only with
             # `GraphQLInputObjectType`. A better solution is to create a separate function
-            if graphql.is_required_input_field(field):  # type: ignore
-                required.append((name, field))
+            if graphql.is_required_input_field(entry[1]):  # type: ignore
+                required.append(entry)
             else:
-                optional[name] = field
+                optional.append(entry)
         if optional:
             return subset_of_fields(optional).map(required.__add__)
         return st.just(required)
-    # pairs are unique by field name
-    return st.lists(st.sampled_from(field_pairs), min_size=1, unique_by=lambda x: x[0])
+    # entries are unique by field name
+    return st.lists(st.sampled_from(fields), min_size=1, max_size=max_size, unique_by=lambda x: x[0])
+
+
+class _Budget(threading.local):
+    # The number of nodes left for the document that is being generated in the current thread
+    remaining: Optional[int] = None
+    # How many times sub-selections of the field that is being generated are repeated, see `list_sizes`
+    multiplier: int = 1
+
+
+_BUDGET = _Budget()
+
+
+@st.composite  # type: ignore
+def with_budget(draw: Any, strategy: st.SearchStrategy[T], max_nodes: int) -> T:
+    """Draw from the strategy with a budget of `max_nodes` selection nodes."""
+    previous = _BUDGET.remaining
+    _BUDGET.remaining = max_nodes
+    try:
+        return draw(strategy)
+    finally:
+        _BUDGET.remaining = previous
+
+
+def spend_budget(
+    items: List[T], get_cost: Callable[[T], int], cheapest: T, *, reserved: int, extra: int = 0
+) -> List[T]:
+    """Take items that fit into the current budget and spend it on them.
+
+    Each item costs the minimum number of nodes needed to generate it. This amount is spent upfront, so that the
+    remaining siblings always have enough budget to be completed. When the item is generated later, the reserved
+    amount is returned to the budget and spent again on the actual choices.
+
+    At least one item is always taken, as an empty selection set is not valid. If none of the drawn items fit, then
+    the `cheapest` one from all possible items is taken instead.
+    """
+    remaining = _BUDGET.remaining
+    if remaining is None:
+        return items
+    remaining += reserved - extra
+    taken = []
+    for item in items:
+        cost = get_cost(item)
+        if cost <= remaining:
+            taken.append(item)
+            remaining -= cost
+    if not taken:
+        # It fits, unless the budget is smaller than the minimal selection. Then the final check will reject it
+        taken.append(cheapest)
+        remaining -= get_cost(cheapest)
+    _BUDGET.remaining = remaining
+    return taken
+
+
+@st.composite  # type: ignore
+def list_sizes(draw: Any, max_size: int) -> int:
+    """Draw a list size that multiplies the cost of sub-selections.
+
+    Sub-selections are repeated for every returned item, therefore the remaining budget is divided between them. The
+    rest of it is returned to the siblings by `field_with_budget`.
+    """
+    remaining = _BUDGET.remaining
+    if remaining is not None:
+        max_size = min(max_size, max(remaining, 1))
+    size = draw(st.integers(min_value=0, max_value=max_size))
+    if remaining is not None and size > 1:
+        _BUDGET.remaining = remaining // size
+        _BUDGET.multiplier *= size
+    return size
+
+
+@st.composite  # type: ignore
+def field_with_budget(
+    draw: Any,
+    arguments: st.SearchStrategy[List[graphql.ArgumentNode]],
+    selections: st.SearchStrategy[Optional[SelectionNodes]],
+) -> Tuple[List[graphql.ArgumentNode], Optional[SelectionNodes]]:
+    """Draw arguments and sub-selections of a field that may have list size arguments.
+
+    The sub-selections are generated within the budget divided by `list_sizes`, and then the budget is restored with
+    the amount they used spent once per returned item.
+    """
+    remaining = _BUDGET.remaining
+    _BUDGET.multiplier = 1
+    values = draw(arguments)
+    multiplier = _BUDGET.multiplier
+    divided = _BUDGET.remaining
+    selected = draw(selections)
+    left = _BUDGET.remaining
+    if multiplier > 1 and remaining is not None and divided is not None and left is not None:
+        _BUDGET.remaining = remaining - (divided - left) * multiplier
+    return values, selected
+
+
+def count_nodes(selections: Optional[SelectionNodes]) -> int:
+    """The total number of fields and inline fragments."""
+    if not selections:
+        return 0
+    total = len(selections)
+    for selection in selections:
+        selection_set = selection.selection_set  # type: ignore
+        if selection_set is not None:
+            total += count_nodes(selection_set.selections)
+    return total
+
+
+def lazy_one_of(builders: Sequence[Callable[[], st.SearchStrategy[T]]]) -> st.SearchStrategy[T]:
+    """Draw from one of the strategies, each is built when it is picked for the first time.
+
+    Like `st.one_of`, it shrinks towards the first strategy.
+    """
+    if len(builders) == 1:
+        return builders[0]()
+    built: Dict[int, st.SearchStrategy[T]] = {}
+
+    def build(idx: int) -> st.SearchStrategy[T]:
+        strategy = built.get(idx)
+        if strategy is None:
+            # Concurrent draws may build the same strategy twice, which is harmless
+            strategy = built[idx] = builders[idx]()
+        return strategy
+
+    return st.integers(min_value=0, max_value=len(builders) - 1).flatmap(build)
+
+
+def cacheable_entry_point(func: Callable[..., st.SearchStrategy[T]]) -> Callable[..., st.SearchStrategy[T]]:
+    """Reuse strategies built for the same arguments.
+
+    Hypothesis' `cacheable` doesn't cache strategies if any argument is not hashable, e.g. `custom_scalars` as a
+    dictionary or `fields` as a list. Therefore, they are normalized first. Omitted arguments are filled with their
+    defaults, so passing a default value explicitly leads to the same strategy too.
+    """
+    cached = cacheable(func)
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    def wrapped(*args: Any, **kwargs: Any) -> st.SearchStrategy[T]:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+        if arguments["fields"] is not None:
+            arguments["fields"] = tuple(arguments["fields"])
+        arguments["custom_scalars"] = validation.normalize_custom_scalars(arguments["custom_scalars"])
+        return cached(*bound.args, **bound.kwargs)
+
+    return wrapped
 
 
 def _make_strategy(
@@ -346,87 +783,329 @@ def _make_strategy(
     type_: graphql.GraphQLObjectType,
     fields: Optional[Iterable[str]] = None,
     custom_scalars: Optional[CustomScalarStrategies] = None,
-) -> st.SearchStrategy[List[graphql.FieldNode]]:
+    node_factory: Callable[..., graphql.DocumentNode],
+    print_ast: AstPrinter,
+    variables: bool,
+    cost_model: Optional[CostModel] = None,
+    **limits: Optional[int],
+) -> st.SearchStrategy[Union[str, OperationWithVariables]]:
     if fields is not None:
         fields = tuple(fields)
         validation.validate_fields(fields, list(type_.fields))
-    if custom_scalars:
-        validation.validate_custom_scalars(custom_scalars)
-    return GraphQLStrategy(schema, custom_scalars or {}).selections(type_, fields=fields)
+    validation.validate_limits(**limits)
+    validation.validate_cost_model(cost_model)
+    strategy = get_strategy(schema, custom_scalars, cost_model=cost_model, **limits)
+    return _make_root_strategy(strategy, type_, fields, node_factory, print_ast, variables)
 
 
-@cacheable  # type: ignore
+@overload
 def queries(
-    schema: Union[str, graphql.GraphQLSchema],
+    schema: Schema,
     *,
     fields: Optional[Iterable[str]] = None,
     custom_scalars: Optional[CustomScalarStrategies] = None,
-    print_ast: AstPrinter = graphql.print_ast,
+    print_ast: AstPrinter = printers.print_ast,
+    max_depth: Optional[int] = None,
+    max_fields_per_selection: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    cost_model: Optional[CostModel] = None,
+    max_cost: Optional[int] = None,
+    variables: "Literal[False]" = False,
+    cache_size: Optional[int] = DEFAULT_CACHE_SIZE,
 ) -> st.SearchStrategy[str]:
+    ...
+
+
+@overload
+def queries(
+    schema: Schema,
+    *,
+    fields: Optional[Iterable[str]] = None,
+    custom_scalars: Optional[CustomScalarStrategies] = None,
+    print_ast: AstPrinter = printers.print_ast,
+    max_depth: Optional[int] = None,
+    max_fields_per_selection: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    cost_model: Optional[CostModel] = None,
+    max_cost: Optional[int] = None,
+    variables: "Literal[True]",
+    cache_size: Optional[int] = DEFAULT_CACHE_SIZE,
+) -> st.SearchStrategy[OperationWithVariables]:
+    ...
+
+
+@overload
+def queries(
+    schema: Schema,
+    *,
+    fields: Optional[Iterable[str]] = None,
+    custom_scalars: Optional[CustomScalarStrategies] = None,
+    print_ast: AstPrinter = printers.print_ast,
+    max_depth: Optional[int] = None,
+    max_fields_per_selection: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    cost_model: Optional[CostModel] = None,
+    max_cost: Optional[int] = None,
+    variables: bool = False,
+    cache_size: Optional[int] = DEFAULT_CACHE_SIZE,
+) -> st.SearchStrategy[Union[str, OperationWithVariables]]:
+    ...
+
+
+@cacheable_entry_point
+def queries(
+    schema: Schema,
+    *,
+    fields: Optional[Iterable[str]] = None,
+    custom_scalars: Optional[CustomScalarStrategies] = None,
+    print_ast: AstPrinter = printers.print_ast,
+    max_depth: Optional[int] = None,
+    max_fields_per_selection: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    cost_model: Optional[CostModel] = None,
+    max_cost: Optional[int] = None,
+    variables: bool = False,
+    cache_size: Optional[int] = DEFAULT_CACHE_SIZE,
+) -> st.SearchStrategy[Union[str, OperationWithVariables]]:
     """A strategy for generating valid queries for the given GraphQL schema.
 
     The output query will contain a subset of fields defined in the `Query` type.
 
-    :param schema: GraphQL schema as a string or `graphql.GraphQLSchema`.
+    :param schema: GraphQL schema as a string, an introspection result (a dictionary or JSON bytes), or `graphql.GraphQLSchema`.
     :param fields: Restrict generated fields to ones in this list.
     :param custom_scalars: Strategies for generating custom scalars.
     :param print_ast: A function to convert the generated AST to a string.
+    :param max_depth: The maximum number of nested selection sets, e.g. `{ getBooks { title } }` has depth 2.
+        Inline fragments don't add a level.
+    :param max_fields_per_selection: The maximum number of fields or inline fragments selected from a single type.
+    :param max_nodes: The maximum total number of fields and inline fragments in a generated operation.
+    :param cost_model: A model for computing the cost of operations, see `hypothesis_graphql.cost.CostModel`.
+    :param max_cost: The maximum cost of a generated operation according to `cost_model`.
+    :param variables: Pass arguments as variables. Then each example is a tuple of the operation, and a dictionary with
+        JSON-compatible values of its variables.
+    :param cache_size: The maximum number of internal strategies cached for the schema. `None` means no limit.
     """
     parsed_schema = validation.maybe_parse_schema(schema)
     if parsed_schema.query_type is None:
         raise InvalidArgument("Query type is not defined in the schema")
-    return (
-        _make_strategy(parsed_schema, type_=parsed_schema.query_type, fields=fields, custom_scalars=custom_scalars)
-        .map(make_query)
-        .map(print_ast)
+    return _make_strategy(
+        parsed_schema,
+        type_=parsed_schema.query_type,
+        fields=fields,
+        custom_scalars=custom_scalars,
+        node_factory=make_query,
+        print_ast=print_ast,
+        variables=variables,
+        max_depth=max_depth,
+        max_fields_per_selection=max_fields_per_selection,
+        max_nodes=max_nodes,
+        cost_model=cost_model,
+        max_cost=max_cost,
+        cache_size=cache_size,
     )
 
 
-@cacheable  # type: ignore
+@overload
 def mutations(
-    schema: Union[str, graphql.GraphQLSchema],
+    schema: Schema,
     *,
     fields: Optional[Iterable[str]] = None,
     custom_scalars: Optional[CustomScalarStrategies] = None,
-    print_ast: AstPrinter = graphql.print_ast,
+    print_ast: AstPrinter = printers.print_ast,
+    max_depth: Optional[int] = None,
+    max_fields_per_selection: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    cost_model: Optional[CostModel] = None,
+    max_cost: Optional[int] = None,
+    variables: "Literal[False]" = False,
+    cache_size: Optional[int] = DEFAULT_CACHE_SIZE,
 ) -> st.SearchStrategy[str]:
+    ...
+
+
+@overload
+def mutations(
+    schema: Schema,
+    *,
+    fields: Optional[Iterable[str]] = None,
+    custom_scalars: Optional[CustomScalarStrategies] = None,
+    print_ast: AstPrinter = printers.print_ast,
+    max_depth: Optional[int] = None,
+    max_fields_per_selection: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    cost_model: Optional[CostModel] = None,
+    max_cost: Optional[int] = None,
+    variables: "Literal[True]",
+    cache_size: Optional[int] = DEFAULT_CACHE_SIZE,
+) -> st.SearchStrategy[OperationWithVariables]:
+    ...
+
+
+@overload
+def mutations(
+    schema: Schema,
+    *,
+    fields: Optional[Iterable[str]] = None,
+    custom_scalars: Optional[CustomScalarStrategies] = None,
+    print_ast: AstPrinter = printers.print_ast,
+    max_depth: Optional[int] = None,
+    max_fields_per_selection: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    cost_model: Optional[CostModel] = None,
+    max_cost: Optional[int] = None,
+    variables: bool = False,
+    cache_size: Optional[int] = DEFAULT_CACHE_SIZE,
+) -> st.SearchStrategy[Union[str, OperationWithVariables]]:
+    ...
+
+
+@cacheable_entry_point
+def mutations(
+    schema: Schema,
+    *,
+    fields: Optional[Iterable[str]] = None,
+    custom_scalars: Optional[CustomScalarStrategies] = None,
+    print_ast: AstPrinter = printers.print_ast,
+    max_depth: Optional[int] = None,
+    max_fields_per_selection: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    cost_model: Optional[CostModel] = None,
+    max_cost: Optional[int] = None,
+    variables: bool = False,
+    cache_size: Optional[int] = DEFAULT_CACHE_SIZE,
+) -> st.SearchStrategy[Union[str, OperationWithVariables]]:
     """A strategy for generating valid mutations for the given GraphQL schema.
 
     The output mutation will contain a subset of fields defined in the `Mutation` type.
 
-    :param schema: GraphQL schema as a string or `graphql.GraphQLSchema`.
+    :param schema: GraphQL schema as a string, an introspection result (a dictionary or JSON bytes), or `graphql.GraphQLSchema`.
     :param fields: Restrict generated fields to ones in this list.
     :param custom_scalars: Strategies for generating custom scalars.
     :param print_ast: A function to convert the generated AST to a string.
+    :param max_depth: The maximum number of nested selection sets, e.g. `{ getBooks { title } }` has depth 2.
+        Inline fragments don't add a level.
+    :param max_fields_per_selection: The maximum number of fields or inline fragments selected from a single type.
+    :param max_nodes: The maximum total number of fields and inline fragments in a generated operation.
+    :param cost_model: A model for computing the cost of operations, see `hypothesis_graphql.cost.CostModel`.
+    :param max_cost: The maximum cost of a generated operation according to `cost_model`.
+    :param variables: Pass arguments as variables. Then each example is a tuple of the operation, and a dictionary with
+        JSON-compatible values of its variables.
+    :param cache_size: The maximum number of internal strategies cached for the schema. `None` means no limit.
     """
     parsed_schema = validation.maybe_parse_schema(schema)
     if parsed_schema.mutation_type is None:
         raise InvalidArgument("Mutation type is not defined in the schema")
-    return (
-        _make_strategy(parsed_schema, type_=parsed_schema.mutation_type, fields=fields, custom_scalars=custom_scalars)
-        .map(make_mutation)
-        .map(print_ast)
+    return _make_strategy(
+        parsed_schema,
+        type_=parsed_schema.mutation_type,
+        fields=fields,
+        custom_scalars=custom_scalars,
+        node_factory=make_mutation,
+        print_ast=print_ast,
+        variables=variables,
+        max_depth=max_depth,
+        max_fields_per_selection=max_fields_per_selection,
+        max_nodes=max_nodes,
+        cost_model=cost_model,
+        max_cost=max_cost,
+        cache_size=cache_size,
     )
 
 
-@cacheable  # type: ignore
+@overload
 def from_schema(
-    schema: Union[str, graphql.GraphQLSchema],
+    schema: Schema,
     *,
     fields: Optional[Iterable[str]] = None,
     custom_scalars: Optional[CustomScalarStrategies] = None,
-    print_ast: AstPrinter = graphql.print_ast,
+    print_ast: AstPrinter = printers.print_ast,
+    max_depth: Optional[int] = None,
+    max_fields_per_selection: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    cost_model: Optional[CostModel] = None,
+    max_cost: Optional[int] = None,
+    variables: "Literal[False]" = False,
+    cache_size: Optional[int] = DEFAULT_CACHE_SIZE,
 ) -> st.SearchStrategy[str]:
+    ...
+
+
+@overload
+def from_schema(
+    schema: Schema,
+    *,
+    fields: Optional[Iterable[str]] = None,
+    custom_scalars: Optional[CustomScalarStrategies] = None,
+    print_ast: AstPrinter = printers.print_ast,
+    max_depth: Optional[int] = None,
+    max_fields_per_selection: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    cost_model: Optional[CostModel] = None,
+    max_cost: Optional[int] = None,
+    variables: "Literal[True]",
+    cache_size: Optional[int] = DEFAULT_CACHE_SIZE,
+) -> st.SearchStrategy[OperationWithVariables]:
+    ...
+
+
+@overload
+def from_schema(
+    schema: Schema,
+    *,
+    fields: Optional[Iterable[str]] = None,
+    custom_scalars: Optional[CustomScalarStrategies] = None,
+    print_ast: AstPrinter = printers.print_ast,
+    max_depth: Optional[int] = None,
+    max_fields_per_selection: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    cost_model: Optional[CostModel] = None,
+    max_cost: Optional[int] = None,
+    variables: bool = False,
+    cache_size: Optional[int] = DEFAULT_CACHE_SIZE,
+) -> st.SearchStrategy[Union[str, OperationWithVariables]]:
+    ...
+
+
+@cacheable_entry_point
+def from_schema(
+    schema: Schema,
+    *,
+    fields: Optional[Iterable[str]] = None,
+    custom_scalars: Optional[CustomScalarStrategies] = None,
+    print_ast: AstPrinter = printers.print_ast,
+    max_depth: Optional[int] = None,
+    max_fields_per_selection: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    cost_model: Optional[CostModel] = None,
+    max_cost: Optional[int] = None,
+    variables: bool = False,
+    cache_size: Optional[int] = DEFAULT_CACHE_SIZE,
+) -> st.SearchStrategy[Union[str, OperationWithVariables]]:
     """A strategy for generating valid queries and mutations for the given GraphQL schema.
 
-    :param schema: GraphQL schema as a string or `graphql.GraphQLSchema`.
+    :param schema: GraphQL schema as a string, an introspection result (a dictionary or JSON bytes), or `graphql.GraphQLSchema`.
     :param fields: Restrict generated fields to ones in this list.
     :param custom_scalars: Strategies for generating custom scalars.
     :param print_ast: A function to convert the generated AST to a string.
+    :param max_depth: The maximum number of nested selection sets, e.g. `{ getBooks { title } }` has depth 2.
+        Inline fragments don't add a level.
+    :param max_fields_per_selection: The maximum number of fields or inline fragments selected from a single type.
+    :param max_nodes: The maximum total number of fields and inline fragments in a generated operation.
+    :param cost_model: A model for computing the cost of operations, see `hypothesis_graphql.cost.CostModel`.
+    :param max_cost: The maximum cost of a generated operation according to `cost_model`.
+    :param variables: Pass arguments as variables. Then each example is a tuple of the operation, and a dictionary with
+        JSON-compatible values of its variables.
+    :param cache_size: The maximum number of internal strategies cached for the schema. `None` means no limit.
     """
     parsed_schema = validation.maybe_parse_schema(schema)
-    if custom_scalars:
-        validation.validate_custom_scalars(custom_scalars)
+    validation.validate_limits(
+        max_depth=max_depth,
+        max_fields_per_selection=max_fields_per_selection,
+        max_nodes=max_nodes,
+        max_cost=max_cost,
+        cache_size=cache_size,
+    )
+    validation.validate_cost_model(cost_model)
     query = parsed_schema.query_type
     mutation = parsed_schema.mutation_type
     query_fields = None
@@ -443,9 +1122,18 @@ def from_schema(
             available_fields.extend(mutation.fields)
         validation.validate_fields(fields, available_fields)
 
-    strategy = GraphQLStrategy(parsed_schema, custom_scalars or {})
-    strategies = [
-        strategy.selections(type_, fields=type_fields).map(node_factory).map(print_ast)
+    strategy = get_strategy(
+        parsed_schema,
+        custom_scalars,
+        max_depth=max_depth,
+        max_fields_per_selection=max_fields_per_selection,
+        max_nodes=max_nodes,
+        cost_model=cost_model,
+        max_cost=max_cost,
+        cache_size=cache_size,
+    )
+    roots = [
+        (type_, type_fields, node_factory)
         for (type_, type_fields, node_factory) in (
             (query, query_fields, make_query),
             (mutation, mutation_fields, make_mutation),
@@ -453,6 +1141,39 @@ def from_schema(
         # If a type is defined in the schema and don't have restrictions on fields or has at least one selected field
         if type_ is not None and (type_fields is None or len(type_fields) > 0)
     ]
-    if not strategies:
+    if not roots:
         raise InvalidArgument("Query or Mutation type must be provided")
-    return reduce(or_, strategies)
+    # Roots that can't be generated within `max_depth` and `max_cost` are skipped
+    selectable = [root for root in roots if strategy.can_select(root[0], root[1])]
+    if not selectable:
+        strategy.validate_selectable(roots[0][0], roots[0][1])
+    # Strategies for roots are built only when they are drawn for the first time. E.g. tests that never draw mutations
+    # don't pay for a large mutation type
+    return lazy_one_of(
+        [
+            partial(_make_root_strategy, strategy, type_, type_fields, node_factory, print_ast, variables)
+            for (type_, type_fields, node_factory) in selectable
+        ]
+    )
+
+
+def _make_root_strategy(
+    strategy: GraphQLStrategy,
+    type_: graphql.GraphQLObjectType,
+    fields: Optional[Tuple[str, ...]],
+    node_factory: Callable[..., graphql.DocumentNode],
+    print_ast: AstPrinter,
+    variables: bool = False,
+) -> st.SearchStrategy[Union[str, OperationWithVariables]]:
+    if variables:
+        return strategy.root_variables(type_, fields=fields).map(
+            partial(_print_with_variables, node_factory, print_ast)
+        )
+    return strategy.root_selections(type_, fields=fields).map(node_factory).map(print_ast)
+
+
+def _print_with_variables(
+    node_factory: Callable[..., graphql.DocumentNode], print_ast: AstPrinter, extracted: ExtractedVariables
+) -> OperationWithVariables:
+    selections, definitions, values = extracted
+    return print_ast(node_factory(selections, definitions)), values
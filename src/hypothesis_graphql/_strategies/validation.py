@@ -1,16 +1,20 @@
-from typing import List, Tuple, Union
+from typing import List, Mapping, Optional, Tuple
 
 import graphql
 from hypothesis import strategies as st
 from hypothesis.errors import InvalidArgument
 
-from ..cache import cached_build_schema
-from ..types import CustomScalarStrategies
+from ..cache import cached_build_client_schema, cached_build_schema
+from ..cost import CostModel
+from ..types import CustomScalars, CustomScalarStrategies, Schema
 
 
-def maybe_parse_schema(schema: Union[str, graphql.GraphQLSchema]) -> graphql.GraphQLSchema:
+def maybe_parse_schema(schema: Schema) -> graphql.GraphQLSchema:
     if isinstance(schema, str):
         return cached_build_schema(schema)
+    if isinstance(schema, (bytes, dict)):
+        # Introspection results are used directly, without converting them to SDL first
+        return cached_build_client_schema(schema)
     return schema
 
 
@@ -23,7 +27,8 @@ def validate_fields(fields_: Tuple[str, ...], available_fields: List[str]) -> No
 
 
 def validate_custom_scalars(strategies: CustomScalarStrategies) -> None:
-    assert isinstance(strategies, dict)
+    if not isinstance(strategies, Mapping):
+        raise InvalidArgument(f"`custom_scalars` should be a mapping, got {strategies!r}")
     for name, strategy in strategies.items():
         validate_scalar_strategy(name, strategy)
 
@@ -36,3 +41,24 @@ def validate_scalar_strategy(name: str, strategy: st.SearchStrategy) -> None:
             f"custom_scalars[{name!r}]={strategy!r} must be a Hypothesis "
             "strategy which generates AST nodes matching this scalar."
         )
+
+
+def validate_limits(**limits: Optional[int]) -> None:
+    for name, value in limits.items():
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 1):
+            raise InvalidArgument(f"`{name}` should be a positive integer, got {value!r}")
+
+
+def validate_cost_model(cost_model: Optional[CostModel]) -> None:
+    if cost_model is not None and not isinstance(cost_model, CostModel):
+        raise InvalidArgument(f"`cost_model` should be an instance of `CostModel`, got {cost_model!r}")
+
+
+def normalize_custom_scalars(strategies: Optional[CustomScalarStrategies]) -> Optional[CustomScalars]:
+    """Validate custom scalars and convert them to a hashable mapping."""
+    if not strategies:
+        return None
+    validate_custom_scalars(strategies)
+    if not isinstance(strategies, CustomScalars):
+        strategies = CustomScalars(strategies)
+    return strategies
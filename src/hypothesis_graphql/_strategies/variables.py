@@ -0,0 +1,151 @@
+"""Passing arguments of generated operations as variables.
+
+Arguments are generated as literals and then moved to variables in a single pass over a finished operation, the same
+way as aliases are resolved. Fields with arguments are copied together with their ancestors, all other nodes are
+reused as is.
+
+Variables are named after their arguments in the document order, e.g. `$id`, `$id_1`, etc. Therefore, operations with
+the same selections are printed the same way regardless of argument values, and only variable values differ.
+
+Strategies for custom scalars may generate variables on their own. Arguments containing them are left as is, and these
+variables are declared with the types of their positions, but have no values.
+"""
+from typing import Any, Dict, List, Tuple
+
+import graphql
+from hypothesis.errors import InvalidArgument
+
+from ..types import SelectionNodes, Variables
+from .aliases import map_selections
+
+# Selections with variable references, definitions of these variables, and their JSON-compatible values
+ExtractedVariables = Tuple[SelectionNodes, List[graphql.VariableDefinitionNode], Variables]
+
+
+def extract_variables(
+    selections: SelectionNodes, parent_type: graphql.GraphQLObjectType, schema: graphql.GraphQLSchema
+) -> ExtractedVariables:
+    """Replace argument values in the given top-level selections with references to variables."""
+    extractor = _Extractor(schema)
+    selections = extractor.selections(selections, parent_type)
+    extractor.assign_names()
+    return selections, extractor.definitions, extractor.values
+
+
+class _Extractor:
+    __slots__ = ("schema", "definitions", "values", "_extracted", "_declared")
+
+    def __init__(self, schema: graphql.GraphQLSchema) -> None:
+        self.schema = schema
+        self.definitions: List[graphql.VariableDefinitionNode] = []
+        self.values: Variables = {}
+        # Variables for extracted arguments are named only after the whole operation is processed, so their names don't
+        # clash with variables generated by strategies for custom scalars
+        self._extracted: List[Tuple[graphql.NameNode, Any]] = []
+        # Types of variables generated by strategies for custom scalars
+        self._declared: Dict[str, Tuple[graphql.VariableDefinitionNode, graphql.GraphQLInputType]] = {}
+
+    def selections(self, selections: SelectionNodes, parent_type: graphql.GraphQLNamedType) -> SelectionNodes:
+        return map_selections(selections, lambda node: self.node(node, parent_type))
+
+    def node(self, node: graphql.SelectionNode, parent_type: graphql.GraphQLNamedType) -> graphql.SelectionNode:
+        selection_set = node.selection_set  # type: ignore
+        if isinstance(node, graphql.InlineFragmentNode):
+            fragment_type = self.schema.type_map[node.type_condition.name.value]
+            selections = self.selections(selection_set.selections, fragment_type)
+            if selections is selection_set.selections:
+                return node
+            return graphql.InlineFragmentNode(
+                type_condition=node.type_condition,
+                directives=node.directives,
+                selection_set=graphql.SelectionSetNode(selections=selections),
+            )
+        field = getattr(parent_type, "fields", {}).get(node.name.value)  # type: ignore
+        if field is None:
+            # E.g. `__typename`
+            return node
+        arguments = node.arguments  # type: ignore
+        if arguments:
+            arguments = [self.argument(argument, field.args[argument.name.value].type) for argument in arguments]
+        if selection_set is not None:
+            selections = self.selections(selection_set.selections, graphql.get_named_type(field.type))
+            if selections is not selection_set.selections:
+                selection_set = graphql.SelectionSetNode(selections=selections)
+        if arguments is node.arguments and selection_set is node.selection_set:  # type: ignore
+            return node
+        return graphql.FieldNode(
+            alias=node.alias,  # type: ignore
+            name=node.name,  # type: ignore
+            arguments=arguments,
+            directives=node.directives,
+            selection_set=selection_set,
+        )
+
+    def argument(self, node: graphql.ArgumentNode, type_: graphql.GraphQLInputType) -> graphql.ArgumentNode:
+        if self.declare_variables(node.value, type_):
+            return node
+        # The argument name is a placeholder until `assign_names` is called
+        variable = graphql.VariableNode(name=graphql.NameNode(value=node.name.value))
+        self.definitions.append(graphql.VariableDefinitionNode(variable=variable, type=make_type_node(type_)))
+        self._extracted.append((variable.name, graphql.value_from_ast_untyped(node.value)))
+        return graphql.ArgumentNode(name=node.name, value=variable)
+
+    def declare_variables(self, node: graphql.ValueNode, type_: graphql.GraphQLInputType) -> bool:
+        """Declare variables used in the given value and return whether there are any."""
+        if isinstance(node, graphql.VariableNode):
+            self.declare(node, type_)
+            return True
+        nullable = type_.of_type if isinstance(type_, graphql.GraphQLNonNull) else type_
+        found = False
+        if isinstance(node, graphql.ListValueNode):
+            item_type = nullable.of_type if isinstance(nullable, graphql.GraphQLList) else type_
+            for value in node.values:
+                found = self.declare_variables(value, item_type) or found
+        elif isinstance(node, graphql.ObjectValueNode):
+            fields = nullable.fields if isinstance(nullable, graphql.GraphQLInputObjectType) else {}
+            for field in node.fields:
+                # Inside values of custom scalars, the type of the scalar itself is used
+                field_type = fields[field.name.value].type if field.name.value in fields else type_
+                found = self.declare_variables(field.value, field_type) or found
+        return found
+
+    def declare(self, node: graphql.VariableNode, type_: graphql.GraphQLInputType) -> None:
+        name = node.name.value
+        declared = self._declared.get(name)
+        if declared is None:
+            definition = graphql.VariableDefinitionNode(variable=node, type=make_type_node(type_))
+            self.definitions.append(definition)
+            self._declared[name] = (definition, type_)
+            return
+        definition, declared_type = declared
+        if graphql.is_type_sub_type_of(self.schema, declared_type, type_):
+            return
+        if not graphql.is_type_sub_type_of(self.schema, type_, declared_type):
+            raise InvalidArgument(
+                f"Variable `${name}` is generated for positions of incompatible types: "
+                f"`{declared_type}` and `{type_}`"
+            )
+        # E.g. `Date!` after `Date`, the stricter type fits both positions
+        definition.type = make_type_node(type_)
+        self._declared[name] = (definition, type_)
+
+    def assign_names(self) -> None:
+        names = set(self._declared)
+        for name_node, value in self._extracted:
+            argument_name = name = name_node.value
+            count = 0
+            while name in names:
+                count += 1
+                name = f"{argument_name}_{count}"
+            names.add(name)
+            name_node.value = name
+            self.values[name] = value
+
+
+def make_type_node(type_: graphql.GraphQLInputType) -> graphql.TypeNode:
+    """Create an AST node for the given input type."""
+    if isinstance(type_, graphql.GraphQLNonNull):
+        return graphql.NonNullTypeNode(type=make_type_node(type_.of_type))
+    if isinstance(type_, graphql.GraphQLList):
+        return graphql.ListTypeNode(type=make_type_node(type_.of_type))
+    return graphql.NamedTypeNode(name=graphql.NameNode(value=type_.name))  # type: ignore
@@ -0,0 +1,183 @@
+"""Generating many examples outside of `@given`.
+
+`@given` runs the full Hypothesis engine: settings, the example database, health checks, shrinking, etc. It is not
+needed when generated queries are consumed directly, e.g. for building a corpus. Here, every example is drawn from
+the strategy directly with a fresh choice sequence driven by a single seeded random generator.
+"""
+import hashlib
+import itertools
+import json
+import multiprocessing
+import random
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, TypeVar, Union
+
+import graphql
+from hypothesis import strategies as st
+from hypothesis.control import BuildContext
+from hypothesis.errors import StopTest, UnsatisfiedAssumption
+from hypothesis.internal.conjecture.data import ConjectureData
+
+from . import cache
+from ._strategies.strategy import from_schema
+from .types import Schema
+
+T = TypeVar("T")
+# Number of consecutive failed draws after which generation gives up
+MAX_FAILED_ATTEMPTS = 1000
+DEFAULT_CHUNK_SIZE = 100
+
+
+def generate(strategy: st.SearchStrategy[T], count: int, *, seed: Optional[int] = None) -> Iterator[T]:
+    """Lazily draw `count` examples from the given strategy.
+
+    Examples are produced one by one and are not stored, so the memory usage doesn't depend on `count`.
+
+    :param strategy: A strategy to draw from, e.g. one returned by `hypothesis_graphql.from_schema`.
+    :param count: Number of examples to generate.
+    :param seed: Seed for the random generator. The same seed leads to the same examples.
+    """
+    if count < 0:
+        raise ValueError(f"`count` should be non-negative, got {count}")
+    # Validation is done once, not on every draw
+    strategy.validate()
+    generator = random.Random(seed)
+    failed = 0
+    produced = 0
+    while produced < count:
+        data = _make_data(generator)
+        try:
+            with _make_build_context(data):
+                example = data.draw(strategy)
+        except (StopTest, UnsatisfiedAssumption):
+            # The choice sequence was exhausted or the draw was rejected by a filter
+            failed += 1
+            if failed >= MAX_FAILED_ATTEMPTS:
+                raise RuntimeError(f"Unable to generate an example after {failed} attempts") from None
+            continue
+        failed = 0
+        produced += 1
+        yield example
+
+
+def generate_parallel(
+    schema: Schema,
+    count: int,
+    *,
+    seed: Optional[int] = None,
+    processes: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **options: Any,
+) -> Iterator[str]:
+    """Lazily generate up to `count` distinct operations in a pool of processes.
+
+    The schema is serialized once and sent to every worker, which builds its own strategy via `from_schema`.
+    Each chunk of `chunk_size` operations is generated with its own seed derived from `seed` and the chunk number, and
+    chunks are collected in order. Therefore the output depends only on `seed` and `chunk_size`, but not on the number
+    of processes. Generation stops earlier if a whole round of chunks doesn't produce any new operation.
+
+    :param schema: GraphQL schema in any format supported by `from_schema`.
+    :param count: Number of distinct operations to generate.
+    :param seed: Base seed for all chunks.
+    :param processes: Number of worker processes. Defaults to the number of CPUs. With `processes=1` operations are
+        generated in the current process.
+    :param chunk_size: Number of operations generated by a worker at once.
+    :param options: Keyword arguments for `from_schema`, e.g. `fields` or `custom_scalars`. They should be picklable.
+        `variables` is not supported.
+    """
+    if count < 0:
+        raise ValueError(f"`count` should be non-negative, got {count}")
+    if chunk_size < 1:
+        raise ValueError(f"`chunk_size` should be positive, got {chunk_size}")
+    if options.get("variables"):
+        # Operations are deduplicated by their text, that is the same for operations with different variables
+        raise ValueError("`variables` is not supported by `generate_parallel`")
+    if seed is None:
+        seed = random.getrandbits(64)
+    processes = processes or multiprocessing.cpu_count()
+    # Enough chunks to keep all workers busy, but not too many to generate a lot of unneeded operations at the end
+    round_size = processes * 4
+    chunks = ((seed, number, chunk_size) for number in itertools.count())
+    # Digests take less memory than operations themselves
+    seen: Set[bytes] = set()
+    if processes == 1:
+        strategy = from_schema(schema, **options)
+        results = (_generate_chunk(chunk, strategy) for chunk in chunks)
+        yield from _collect(results, count, round_size, seen)
+    else:
+        initargs = (_serialize_schema(schema), cache.get_cache_directory(), options)
+        with multiprocessing.Pool(processes, initializer=_init_worker, initargs=initargs) as pool:
+            # `imap` consumes its input eagerly, therefore chunks are submitted in rounds
+            rounds = (pool.imap(_generate_chunk, itertools.islice(chunks, round_size)) for _ in itertools.count())
+            yield from _collect(itertools.chain.from_iterable(rounds), count, round_size, seen)
+
+
+def _collect(results: Iterator[List[str]], count: int, round_size: int, seen: Set[bytes]) -> Iterator[str]:
+    produced = 0
+    while produced < count:
+        found = False
+        for operations in itertools.islice(results, round_size):
+            for operation in operations:
+                digest = hashlib.blake2b(operation.encode("utf8"), digest_size=16).digest()
+                if digest in seen:
+                    continue
+                seen.add(digest)
+                found = True
+                produced += 1
+                yield operation
+                if produced == count:
+                    return
+        if not found:
+            # All distinct operations are likely generated already
+            return
+
+
+def _serialize_schema(schema: Schema) -> Union[str, bytes]:
+    if isinstance(schema, graphql.GraphQLSchema):
+        return graphql.print_schema(schema)
+    if isinstance(schema, dict):
+        return json.dumps(schema).encode("utf8")
+    return schema
+
+
+_worker_strategy: Optional[st.SearchStrategy[str]] = None
+
+
+def _init_worker(source: Union[str, bytes], cache_directory: Optional[Path], options: Dict[str, Any]) -> None:
+    global _worker_strategy  # pylint: disable=global-statement
+    # Workers started via "spawn" don't inherit the persistent cache settings
+    if cache_directory is not None and cache.get_cache_directory() != cache_directory:
+        cache.set_cache_directory(cache_directory)
+    _worker_strategy = from_schema(source, **options)
+
+
+def _generate_chunk(chunk: Tuple[int, int, int], strategy: Optional[st.SearchStrategy[str]] = None) -> List[str]:
+    seed, number, size = chunk
+    if strategy is None:
+        strategy = _worker_strategy
+    assert strategy is not None
+    return list(generate(strategy, size, seed=_derive_seed(seed, number)))
+
+
+def _derive_seed(seed: int, number: int) -> int:
+    digest = hashlib.blake2b(f"{seed}-{number}".encode("utf8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _make_data(generator: random.Random) -> ConjectureData:
+    try:
+        return ConjectureData(random=generator)
+    except TypeError:  # pragma: no cover
+        # Older Hypothesis versions require an explicit buffer, e.g. 6.31.6. Tested in the `oldest` tox environment
+        from hypothesis.internal.conjecture.engine import BUFFER_SIZE
+
+        return ConjectureData(max_length=BUFFER_SIZE, prefix=b"", random=generator)  # type: ignore
+
+
+def _make_build_context(data: ConjectureData) -> BuildContext:
+    # Some strategies (e.g. `st.lists`) require a build context
+    try:
+        return BuildContext(data, is_final=False, wrapped_test=generate)
+    except TypeError:  # pragma: no cover
+        # Older Hypothesis versions don't accept `wrapped_test`
+        return BuildContext(data, is_final=False)  # type: ignore
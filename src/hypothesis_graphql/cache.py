@@ -1,8 +1,310 @@
-from functools import lru_cache
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, Type, TypeVar, Union
 
+import attr
 import graphql
 
+CACHE_DIRECTORY_ENV_VAR = "HYPOTHESIS_GRAPHQL_CACHE_DIR"
+# Bump it when the on-disk format changes
+CACHE_FORMAT_VERSION = 2
+SCHEMA_REGISTRY_SIZE = 32
 
-@lru_cache(maxsize=32)
-def cached_build_schema(schema: str) -> graphql.GraphQLSchema:
+T = TypeVar("T")
+SchemaSource = Union[str, bytes, Dict[str, Any]]
+
+_cache_directory: Optional[Path] = None
+if os.environ.get(CACHE_DIRECTORY_ENV_VAR):
+    _cache_directory = Path(os.environ[CACHE_DIRECTORY_ENV_VAR])
+
+
+@attr.s(slots=True, frozen=True)
+class CacheInfo:
+    """Cache statistics."""
+
+    hits: int = attr.ib()
+    misses: int = attr.ib()
+    evictions: int = attr.ib()
+    size: int = attr.ib()
+    maxsize: Optional[int] = attr.ib()
+
+
+@attr.s(slots=True)
+class LRUCache(Generic[T]):
+    """A mapping that keeps at most `maxsize` recently used entries.
+
+    With `maxsize=None` the cache is unbounded.
+    """
+
+    maxsize: Optional[int] = attr.ib(default=None)
+    _data: "OrderedDict[Hashable, T]" = attr.ib(factory=OrderedDict, init=False)
+    hits: int = attr.ib(default=0, init=False)
+    misses: int = attr.ib(default=0, init=False)
+    evictions: int = attr.ib(default=0, init=False)
+
+    def get(self, key: Hashable) -> Optional[T]:
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.maxsize is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: T) -> None:
+        self._data[key] = value
+        if self.maxsize is not None and len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> Optional[T]:
+        return self._data.pop(key, None)
+
+    def values(self) -> Any:
+        return self._data.values()
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            hits=self.hits, misses=self.misses, evictions=self.evictions, size=len(self._data), maxsize=self.maxsize
+        )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def compute_fingerprint(schema: SchemaSource) -> str:
+    """Compute a digest of the schema source.
+
+    It could be computed once and passed to `cached_build_schema` to avoid hashing the source on every call.
+    """
+    if isinstance(schema, dict):
+        schema = json.dumps(schema, sort_keys=True)
+    if isinstance(schema, str):
+        schema = schema.encode("utf8")
+    return hashlib.blake2b(schema, digest_size=20).hexdigest()
+
+
+def _source_size(schema: SchemaSource) -> int:
+    if isinstance(schema, dict):
+        return len(json.dumps(schema))
+    return len(schema)
+
+
+@attr.s(slots=True)
+class RegistryEntry:
+    schema: graphql.GraphQLSchema = attr.ib()
+    # Size of the schema source. It is a cheap proxy for the memory taken by the built schema
+    source_size: int = attr.ib()
+
+
+@attr.s(slots=True)
+class SchemaRegistry:
+    """Built schemas keyed by fingerprints of their sources.
+
+    Sources are not stored. The last seen string or bytes source is remembered, so repeated calls with the same
+    object don't compute its fingerprint again.
+    """
+
+    maxsize: Optional[int] = attr.ib(default=SCHEMA_REGISTRY_SIZE)
+    _entries: LRUCache[RegistryEntry] = attr.ib(init=False)
+    _last_seen: Tuple[Optional[Union[str, bytes]], str] = attr.ib(default=(None, ""), init=False)
+
+    @_entries.default
+    def _make_entries(self) -> LRUCache[RegistryEntry]:
+        return LRUCache(self.maxsize)
+
+    def get(
+        self,
+        schema: SchemaSource,
+        builder: Callable[[Any, str], graphql.GraphQLSchema],
+        fingerprint: Optional[str] = None,
+    ) -> graphql.GraphQLSchema:
+        if fingerprint is None:
+            fingerprint = self.fingerprint(schema)
+        entry = self._entries.get(fingerprint)
+        if entry is None:
+            entry = RegistryEntry(schema=builder(schema, fingerprint), source_size=_source_size(schema))
+            self._entries.set(fingerprint, entry)
+        return entry.schema
+
+    def fingerprint(self, schema: SchemaSource) -> str:
+        if isinstance(schema, dict):
+            # Dictionaries are mutable, their identity is not enough
+            return compute_fingerprint(schema)
+        last_seen, last_fingerprint = self._last_seen
+        if last_seen is schema:
+            return last_fingerprint
+        computed = compute_fingerprint(schema)
+        self._last_seen = (schema, computed)
+        return computed
+
+    def info(self) -> CacheInfo:
+        return self._entries.info()
+
+    def memory_usage(self) -> int:
+        """Total size of sources of all stored schemas."""
+        return sum(entry.source_size for entry in self._entries.values())
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._last_seen = (None, "")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+registry = SchemaRegistry()
+
+
+def set_cache_directory(path: Optional[Union[str, Path]]) -> None:
+    """Enable the persistent schema cache in the given directory or disable it with `None`.
+
+    The directory could be also set via the `HYPOTHESIS_GRAPHQL_CACHE_DIR` environment variable.
+    """
+    global _cache_directory  # pylint: disable=global-statement
+    _cache_directory = Path(path) if path is not None else None
+    registry.clear()
+
+
+def get_cache_directory() -> Optional[Path]:
+    return _cache_directory
+
+
+def cached_build_schema(schema: str, fingerprint: Optional[str] = None) -> graphql.GraphQLSchema:
+    """Build a schema or take it from the registry.
+
+    :param schema: Schema source in SDL.
+    :param fingerprint: Precomputed value of `hypothesis_graphql.cache.compute_fingerprint(schema)`.
+    """
+    return registry.get(schema, _build_schema, fingerprint)
+
+
+def cached_build_client_schema(
+    introspection: Union[bytes, Dict[str, Any]], fingerprint: Optional[str] = None
+) -> graphql.GraphQLSchema:
+    """Build a schema from an introspection result or take it from the registry.
+
+    :param introspection: Introspection result as a dictionary or JSON bytes. Both, the raw response with the "data"
+        key and its content are supported.
+    :param fingerprint: Precomputed value of `hypothesis_graphql.cache.compute_fingerprint(introspection)`.
+    """
+    return registry.get(introspection, _build_client_schema, fingerprint)
+
+
+def _build_client_schema(introspection: Union[bytes, Dict[str, Any]], fingerprint: str) -> graphql.GraphQLSchema:
+    data = json.loads(introspection) if isinstance(introspection, bytes) else introspection
+    if "__schema" not in data and "data" in data:
+        data = data["data"]
+    return graphql.build_client_schema(data)  # type: ignore
+
+
+def _build_schema(schema: str, fingerprint: str) -> graphql.GraphQLSchema:
+    if _cache_directory is not None:
+        return _build_schema_persistent(schema, fingerprint, _cache_directory)
     return graphql.build_schema(schema)
+
+
+def _build_schema_persistent(schema: str, fingerprint: str, directory: Path) -> graphql.GraphQLSchema:
+    """Build a schema, reusing a parsed SDL document stored on disk if possible.
+
+    Parsing is the most expensive part of `graphql.build_schema`, therefore the parsed document is stored on disk as
+    JSON, that is much faster to load. Stored files contain only data, they are never executed. Schemas are validated
+    when they are built for the first time, so documents loaded from the cache are not validated again. Any problem
+    with the stored document leads to a rebuild.
+    """
+    key = f"{fingerprint}-{graphql.version}-{CACHE_FORMAT_VERSION}"
+    path = directory / f"{key}.json"
+    document = _load_document(path, key)
+    if document is not None:
+        return graphql.build_ast_schema(document, assume_valid_sdl=True)
+    # Locations are not needed for generating queries and make stored documents much larger
+    document = graphql.parse(schema, no_location=True)
+    built = graphql.build_ast_schema(document)
+    _store_document(path, key, document)
+    return built
+
+
+def _load_document(path: Path, key: str) -> Optional[graphql.DocumentNode]:
+    try:
+        with path.open("rb") as fd:
+            stored = json.load(fd, object_hook=_node_from_data)
+        if stored["key"] != key:
+            return None
+        document = stored["document"]
+    except Exception:
+        # Missing or corrupted file
+        return None
+    if not isinstance(document, graphql.DocumentNode):
+        return None
+    return document
+
+
+def _store_document(path: Path, key: str, document: graphql.DocumentNode) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first, so concurrent readers (e.g. other pytest workers) never see partial data
+        fd, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf8") as file:
+                json.dump({"key": key, "document": _node_to_data(document)}, file, separators=(",", ":"))
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+    except OSError:
+        # The cache is an optimization, a read-only or full disk should not break query generation
+        pass
+
+
+# AST node classes by their names, used to restore stored documents. Names are used instead of `kind`, as some node
+# classes share it, e.g. `DirectiveNode` and `ConstDirectiveNode`
+_NODE_CLASSES: Dict[str, Type[graphql.Node]] = {
+    name: cls
+    for name, cls in vars(graphql.language.ast).items()
+    if isinstance(cls, type) and issubclass(cls, graphql.Node)
+}
+
+
+def _node_to_data(value: Any) -> Any:
+    """Convert an AST without locations to JSON-compatible data."""
+    if isinstance(value, graphql.Node):
+        data = {key: _node_to_data(getattr(value, key)) for key in value.keys if key != "loc"}
+        data["node"] = value.__class__.__name__
+        return data
+    if isinstance(value, (list, tuple)):
+        return [_node_to_data(item) for item in value]
+    if isinstance(value, graphql.OperationType):
+        return value.value
+    return value
+
+
+def _node_from_data(data: Dict[str, Any]) -> Any:
+    """Restore an AST node from data produced by `_node_to_data`.
+
+    It is used as `object_hook` for `json.load`, therefore nested nodes are already restored.
+    """
+    name = data.get("node")
+    if name is None:
+        # Not a node, e.g. the top-level object
+        return data
+    if "operation" in data:
+        # The only enum in schema documents, e.g. `query: Query` in a schema definition
+        data["operation"] = graphql.OperationType(data["operation"])
+    cls = _NODE_CLASSES[name]
+    # The same as `Node.__init__`, but ~2x faster, which matters for large schemas
+    node: graphql.Node = object.__new__(cls)
+    for key in cls.keys:
+        value = data.get(key)
+        if value.__class__ is list:
+            value = tuple(value)
+        setattr(node, key, value)
+    return node
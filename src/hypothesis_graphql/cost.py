@@ -0,0 +1,125 @@
+"""Estimating the cost of GraphQL operations.
+
+Many GraphQL servers and gateways reject operations whose estimated cost is above some limit. The cost usually depends
+on the number of selected fields and on the number of items that list fields may return.
+"""
+from typing import Dict, Iterable, Mapping, Optional, Tuple, Union
+
+import attr
+import graphql
+
+from ._strategies import validation
+from .types import Schema
+
+DEFAULT_LIST_SIZE_ARGUMENTS = ("first", "last", "limit")
+
+
+def _to_items(weights: Union[Mapping[str, int], Iterable[Tuple[str, int]]]) -> Tuple[Tuple[str, int], ...]:
+    if isinstance(weights, Mapping):
+        weights = weights.items()
+    return tuple(sorted(weights))
+
+
+@attr.s(slots=True, frozen=True)
+class CostModel:
+    """A model for computing the cost of operations.
+
+    The cost of a field is its weight plus the cost of its selection set multiplied by the expected number of
+    returned items:
+
+        cost(field) = weight(field) + multiplier(field) * cost(selection set)
+
+    The multiplier is the value of the first argument from `list_size_arguments` passed to the field as an integer
+    literal, or its default value if it is not passed. Otherwise, it is `default_list_size` for list fields and 1 for
+    other fields. Costs of inline fragments are added to the cost of the selection set they belong to.
+
+    :param weights: Weights of specific fields keyed by "Type.field", e.g. `{"Query.search": 10}`.
+    :param default_weight: Weight of other fields.
+    :param list_size_arguments: Names of arguments that define the number of returned items.
+    :param default_list_size: The expected number of items returned by list fields without size arguments.
+    """
+
+    weights: Tuple[Tuple[str, int], ...] = attr.ib(factory=tuple, converter=_to_items)
+    default_weight: int = attr.ib(default=1)
+    list_size_arguments: Tuple[str, ...] = attr.ib(default=DEFAULT_LIST_SIZE_ARGUMENTS, converter=tuple)
+    default_list_size: int = attr.ib(default=1)
+    _weights: Dict[str, int] = attr.ib(init=False, eq=False, repr=False)
+
+    @_weights.default
+    def _make_weights(self) -> Dict[str, int]:
+        return dict(self.weights)
+
+    def weight(self, type_name: str, field_name: str) -> int:
+        return self._weights.get(f"{type_name}.{field_name}", self.default_weight)
+
+    def min_weight(self) -> int:
+        return min([self.default_weight, *(weight for _, weight in self.weights)])
+
+    def multiplier(self, field: graphql.GraphQLField, node: graphql.FieldNode) -> int:
+        passed = {argument.name.value: argument.value for argument in node.arguments or ()}
+        for name in self.list_size_arguments:
+            if name in passed:
+                value = passed[name]
+                if isinstance(value, graphql.IntValueNode):
+                    return max(int(value.value), 0)
+                continue
+            definition = field.args.get(name)
+            if definition is not None and isinstance(definition.default_value, int):
+                return max(definition.default_value, 0)
+        if graphql.is_list_type(graphql.get_nullable_type(field.type)):  # type: ignore
+            return self.default_list_size
+        return 1
+
+    def selections_cost(
+        self,
+        selections: Optional[Iterable[graphql.SelectionNode]],
+        parent_type: graphql.GraphQLNamedType,
+        schema: graphql.GraphQLSchema,
+    ) -> int:
+        """The total cost of selections on the given type."""
+        total = 0
+        for selection in selections or ():
+            if isinstance(selection, graphql.FieldNode):
+                name = selection.name.value
+                fields = getattr(parent_type, "fields", {})
+                if name not in fields:
+                    # E.g. `__typename`
+                    continue
+                field = fields[name]
+                cost = self.weight(parent_type.name, name)
+                if selection.selection_set is not None and selection.selection_set.selections:
+                    children = self.selections_cost(
+                        selection.selection_set.selections, graphql.get_named_type(field.type), schema
+                    )
+                    cost += self.multiplier(field, selection) * children
+                total += cost
+            elif isinstance(selection, graphql.InlineFragmentNode):
+                fragment_type = parent_type
+                if selection.type_condition is not None:
+                    fragment_type = schema.type_map[selection.type_condition.name.value]
+                total += self.selections_cost(selection.selection_set.selections, fragment_type, schema)
+        return total
+
+
+DEFAULT_COST_MODEL = CostModel()
+
+
+def compute_cost(
+    operation: Union[str, graphql.DocumentNode], schema: Schema, cost_model: Optional[CostModel] = None
+) -> int:
+    """Compute the total cost of all operations in the given document.
+
+    :param operation: A GraphQL document as a string or an AST.
+    :param schema: GraphQL schema in any format supported by `from_schema`.
+    :param cost_model: A cost model. By default, each field has weight 1, and lists are expected to have 1 item.
+    """
+    parsed_schema = validation.maybe_parse_schema(schema)
+    model = cost_model or DEFAULT_COST_MODEL
+    document = graphql.parse(operation) if isinstance(operation, str) else operation
+    total = 0
+    for definition in document.definitions:
+        if isinstance(definition, graphql.OperationDefinitionNode):
+            root = parsed_schema.get_root_type(definition.operation)
+            if root is not None:
+                total += model.selections_cost(definition.selection_set.selections, root, parsed_schema)
+    return total
@@ -36,7 +36,7 @@ def List(
     return ListValueNode(values=values)
 
 
-# Boolean & Enum nodes have a limited set of variants, therefore caching is effective in this case
+# Boolean nodes have only two variants, therefore caching is effective in this case
 
 
 @lru_cache()
@@ -44,9 +44,11 @@ def Boolean(value: bool) -> graphql.BooleanValueNode:
     return graphql.BooleanValueNode(value=value)
 
 
-@lru_cache()
-def Enum(value: str) -> graphql.EnumValueNode:
-    return graphql.EnumValueNode(value=value)
+# Enum values are not bounded across schemas. Generated ones are taken from a per-strategy table instead
+def Enum(
+    value: str, EnumValueNode: typing.Type[graphql.EnumValueNode] = graphql.EnumValueNode
+) -> graphql.EnumValueNode:
+    return EnumValueNode(value=value)
 
 
 Null = graphql.NullValueNode()
@@ -0,0 +1,235 @@
+"""Printers for generated GraphQL documents.
+
+`graphql.print_ast` is a generic visitor-based printer that handles any GraphQL AST. Generated documents contain only
+a few node kinds, and printing them directly is considerably faster.
+
+Any of these printers could be passed as `print_ast` to `queries`, `mutations` and `from_schema`.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type, Union
+
+import graphql
+
+try:
+    from graphql.language.print_string import print_string
+except ImportError:  # pragma: no cover
+    # `graphql-core` < 3.2
+    import json
+
+    def print_string(s: str) -> str:
+        return json.dumps(s)
+
+
+# Arguments are printed on separate lines if the line with the field is longer than this
+MAX_LINE_LENGTH = 80
+INDENT = "  "
+
+
+class Printer:
+    """Print AST nodes exactly as `graphql.print_ast` does.
+
+    Node kinds that are never generated by `hypothesis-graphql` are delegated to `graphql.print_ast`.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self) -> None:
+        self._values: Dict[Type[graphql.Node], Callable[[Any], str]] = {
+            graphql.StringValueNode: self.string_value,
+            graphql.IntValueNode: self.raw_value,
+            graphql.FloatValueNode: self.raw_value,
+            graphql.EnumValueNode: self.raw_value,
+            graphql.BooleanValueNode: self.boolean_value,
+            graphql.NullValueNode: self.null_value,
+            graphql.ListValueNode: self.list_value,
+            graphql.ObjectValueNode: self.object_value,
+            graphql.VariableNode: self.variable,
+        }
+
+    def __call__(self, node: graphql.Node) -> str:
+        if isinstance(node, graphql.DocumentNode):
+            return self.document(node)
+        if isinstance(node, graphql.OperationDefinitionNode):
+            return self.operation_definition(node)
+        if isinstance(node, graphql.ValueNode):
+            return self.value(node)
+        return graphql.print_ast(node)
+
+    def document(self, node: graphql.DocumentNode) -> str:
+        return "\n\n".join(self(definition) for definition in node.definitions)
+
+    def operation_definition(self, node: graphql.OperationDefinitionNode) -> str:
+        if node.name or node.directives or not _are_plain(node.variable_definitions):
+            return graphql.print_ast(node)
+        selection_set = self.selection_set(node.selection_set, 0)
+        if node.variable_definitions:
+            definitions = ", ".join(self.variable_definition(definition) for definition in node.variable_definitions)
+            return f"{node.operation.value} ({definitions}) {selection_set}"
+        if node.operation == graphql.OperationType.QUERY:
+            # Anonymous queries use the short form
+            return selection_set
+        return f"{node.operation.value} {selection_set}"
+
+    def variable_definition(self, node: graphql.VariableDefinitionNode) -> str:
+        return f"${node.variable.name.value}: {self.type_reference(node.type)}"
+
+    def type_reference(self, node: graphql.TypeNode) -> str:
+        if isinstance(node, graphql.NonNullTypeNode):
+            return f"{self.type_reference(node.type)}!"
+        if isinstance(node, graphql.ListTypeNode):
+            return f"[{self.type_reference(node.type)}]"
+        return node.name.value  # type: ignore
+
+    def selection_set(self, node: Optional[graphql.SelectionSetNode], level: int) -> str:
+        if node is None or not node.selections:
+            return ""
+        inner = level + 1
+        lines: List[str] = []
+        prefix = INDENT * inner
+        for selection in node.selections:
+            if isinstance(selection, graphql.FieldNode):
+                lines.append(prefix + self.field(selection, inner))
+            elif isinstance(selection, graphql.InlineFragmentNode):
+                lines.append(prefix + self.inline_fragment(selection, inner))
+            else:
+                lines.append(prefix + graphql.print_ast(selection))
+        return "{\n" + "\n".join(lines) + "\n" + INDENT * level + "}"
+
+    def field(self, node: graphql.FieldNode, level: int) -> str:
+        prefix = f"{node.alias.value}: {node.name.value}" if node.alias else node.name.value
+        if node.arguments:
+            arguments = [self.argument(argument) for argument in node.arguments]
+            line = f"{prefix}({', '.join(arguments)})"
+            if len(line) > MAX_LINE_LENGTH:
+                line = f"{prefix}(\n{INDENT}" + "\n".join(arguments).replace("\n", f"\n{INDENT}") + "\n)"
+            if "\n" in line:
+                # Multiline arguments or block strings are indented together with the field
+                line = line.replace("\n", "\n" + INDENT * level)
+        else:
+            line = prefix
+        selection_set = self.selection_set(node.selection_set, level)
+        if selection_set:
+            return f"{line} {selection_set}"
+        return line
+
+    def inline_fragment(self, node: graphql.InlineFragmentNode, level: int) -> str:
+        selection_set = self.selection_set(node.selection_set, level)
+        if selection_set:
+            return f"... on {node.type_condition.name.value} {selection_set}"
+        return f"... on {node.type_condition.name.value}"
+
+    def argument(self, node: graphql.ArgumentNode) -> str:
+        return f"{node.name.value}: {self.value(node.value)}"
+
+    def value(self, node: graphql.ValueNode) -> str:
+        method = self._values.get(node.__class__)
+        if method is None:
+            # E.g. variables or custom node types produced by strategies for custom scalars
+            return graphql.print_ast(node)
+        return method(node)
+
+    def string_value(self, node: graphql.StringValueNode) -> str:
+        if node.block:
+            return graphql.print_ast(node)
+        return print_string(node.value)
+
+    def variable(self, node: graphql.VariableNode) -> str:
+        return f"${node.name.value}"
+
+    def raw_value(self, node: Any) -> str:
+        return node.value
+
+    def boolean_value(self, node: graphql.BooleanValueNode) -> str:
+        return "true" if node.value else "false"
+
+    def null_value(self, node: graphql.NullValueNode) -> str:
+        return "null"
+
+    def list_value(self, node: graphql.ListValueNode) -> str:
+        return f"[{', '.join(self.value(value) for value in node.values)}]"
+
+    def object_value(self, node: graphql.ObjectValueNode) -> str:
+        return "{" + ", ".join(f"{field.name.value}: {self.value(field.value)}" for field in node.fields) + "}"
+
+
+class CompactPrinter(Printer):
+    """Print AST nodes with minimal whitespace and without indentation.
+
+    With `sort_arguments=True`, arguments and input object fields are sorted by name, so documents that differ only in
+    their order are printed the same way.
+    """
+
+    __slots__ = ("sort_arguments",)
+
+    def __init__(self, sort_arguments: bool = False) -> None:
+        super().__init__()
+        self.sort_arguments = sort_arguments
+
+    def operation_definition(self, node: graphql.OperationDefinitionNode) -> str:
+        if node.name or node.directives or not _are_plain(node.variable_definitions):
+            return graphql.print_ast(node)
+        selection_set = self.selection_set(node.selection_set, 0)
+        if node.variable_definitions:
+            definitions = (
+                sorted(node.variable_definitions, key=_by_variable_name)
+                if self.sort_arguments
+                else node.variable_definitions
+            )
+            printed = ",".join(self.variable_definition(definition) for definition in definitions)
+            return f"{node.operation.value}({printed}){selection_set}"
+        if node.operation == graphql.OperationType.QUERY:
+            return selection_set
+        return f"{node.operation.value}{selection_set}"
+
+    def variable_definition(self, node: graphql.VariableDefinitionNode) -> str:
+        return f"${node.variable.name.value}:{self.type_reference(node.type)}"
+
+    def selection_set(self, node: Optional[graphql.SelectionSetNode], level: int) -> str:
+        if node is None or not node.selections:
+            return ""
+        printed = []
+        for selection in node.selections:
+            if isinstance(selection, graphql.FieldNode):
+                printed.append(self.field(selection, level))
+            elif isinstance(selection, graphql.InlineFragmentNode):
+                printed.append(self.inline_fragment(selection, level))
+            else:
+                printed.append(graphql.print_ast(selection))
+        return "{" + " ".join(printed) + "}"
+
+    def field(self, node: graphql.FieldNode, level: int) -> str:
+        line = f"{node.alias.value}:{node.name.value}" if node.alias else node.name.value
+        if node.arguments:
+            arguments = sorted(node.arguments, key=_by_name) if self.sort_arguments else node.arguments
+            line += f"({','.join(self.argument(argument) for argument in arguments)})"
+        return line + self.selection_set(node.selection_set, level)
+
+    def inline_fragment(self, node: graphql.InlineFragmentNode, level: int) -> str:
+        return f"...on {node.type_condition.name.value}{self.selection_set(node.selection_set, level)}"
+
+    def argument(self, node: graphql.ArgumentNode) -> str:
+        return f"{node.name.value}:{self.value(node.value)}"
+
+    def list_value(self, node: graphql.ListValueNode) -> str:
+        return f"[{','.join(self.value(value) for value in node.values)}]"
+
+    def object_value(self, node: graphql.ObjectValueNode) -> str:
+        fields = sorted(node.fields, key=_by_name) if self.sort_arguments else node.fields
+        return "{" + ",".join(f"{field.name.value}:{self.value(field.value)}" for field in fields) + "}"
+
+
+def _by_name(node: Union[graphql.ArgumentNode, graphql.ObjectFieldNode]) -> str:
+    return node.name.value
+
+
+def _by_variable_name(node: graphql.VariableDefinitionNode) -> str:
+    return node.variable.name.value
+
+
+def _are_plain(definitions: Optional[Iterable[graphql.VariableDefinitionNode]]) -> bool:
+    """Whether variable definitions have neither default values nor directives, like generated ones."""
+    return all(not definition.default_value and not definition.directives for definition in definitions or ())
+
+
+print_ast = Printer()
+print_compact = CompactPrinter()
+print_compact_sorted = CompactPrinter(sort_arguments=True)
@@ -1,4 +1,4 @@
-from typing import Callable, Dict, List, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 
 import graphql
 from hypothesis import strategies as st
@@ -10,4 +10,45 @@ Field = Union[graphql.GraphQLField, graphql.GraphQLInputField]
 InterfaceOrObject = Union[graphql.GraphQLObjectType, graphql.GraphQLInterfaceType]
 SelectionNodes = List[graphql.SelectionNode]
 AstPrinter = Callable[[graphql.Node], str]
-CustomScalarStrategies = Dict[str, st.SearchStrategy[graphql.ValueNode]]
+CustomScalarStrategies = Mapping[str, st.SearchStrategy[graphql.ValueNode]]
+IntrospectionResult = Dict[str, Any]
+# JSON-compatible values of operation variables keyed by their names
+Variables = Dict[str, Any]
+# A printed operation together with its variables
+OperationWithVariables = Tuple[str, Variables]
+# SDL as a string, an introspection result as a dictionary or JSON bytes, or a built schema
+Schema = Union[str, bytes, IntrospectionResult, graphql.GraphQLSchema]
+
+
+class CustomScalars(Mapping[str, st.SearchStrategy[graphql.ValueNode]]):
+    """An immutable mapping of custom scalar names to strategies that generate their AST nodes.
+
+    Unlike a dictionary, it is hashable, therefore strategies built with the same custom scalars are reused.
+    Dictionaries passed as `custom_scalars` are converted to it.
+    """
+
+    __slots__ = ("_strategies", "_hash")
+
+    def __init__(
+        self,
+        strategies: Union[CustomScalarStrategies, Iterable[Tuple[str, st.SearchStrategy[graphql.ValueNode]]]] = (),
+    ) -> None:
+        self._strategies = dict(strategies)
+        self._hash: Optional[int] = None
+
+    def __getitem__(self, name: str) -> st.SearchStrategy[graphql.ValueNode]:
+        return self._strategies[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._strategies)
+
+    def __len__(self) -> int:
+        return len(self._strategies)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self._strategies.items()))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._strategies!r})"
@@ -0,0 +1,281 @@
+"""Benchmarks over the bundled APIs-guru corpus.
+
+Metrics for each schema:
+  - `build_schema` - seconds to build the schema from SDL
+  - `construction` - seconds to build strategies for all fields of all composite types
+  - `first_draw` - seconds to create a `from_schema` strategy for a fresh schema and draw the first operation
+  - `operations_per_second` - throughput of subsequent draws
+  - `peak_memory` - peak bytes allocated while creating the strategy and drawing all operations
+  - `document_size` - average size of generated operations in bytes
+  - `document_memory` - average bytes retained by the AST of a generated operation. It shows how lean node
+    construction is, as strategy caches are warmed up before measuring
+  - `factory_hits`, `factory_misses` and `factory_size` - statistics of the node factory table after drawing operations
+  - `fragments_per_second` - throughput of draws from selections of unions and interfaces with implementations, that
+    consist of inline fragments. It is absent for schemas without such types
+
+Unions and interfaces are common in `FRAGMENT_SCHEMAS`, pass `--fragment-schemas` to benchmark only them.
+
+Everything runs offline and operations are drawn from a fixed seed, so results of different runs, e.g. on different
+releases, could be compared via `--baseline`. Each metric is then also reported as a ratio to its baseline value.
+
+Usage:
+
+    python test/benchmarks.py [--schema NAME ...] [--fragment-schemas] [--repeat N] [--examples N] [--seed N]
+                              [--max-depth N] [--max-nodes N] [--output FILE] [--baseline FILE]
+"""
+import argparse
+import gc
+import json
+import pathlib
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import graphql
+from hypothesis import strategies as st
+
+from hypothesis_graphql import from_schema, generate, nodes
+from hypothesis_graphql._strategies.index import _INDEXES
+from hypothesis_graphql._strategies.strategy import BUILT_IN_SCALAR_TYPE_NAMES, GraphQLStrategy, get_strategy
+
+HERE = pathlib.Path(__file__).parent
+CORPUS_PATH = HERE / "corpus-api-guru-catalog.json"
+INVALID_SCHEMAS = {"Gitlab"}
+PLACEHOLDER_STRATEGY = st.just("placeholder").map(nodes.String)
+# Schemas with many unions and interfaces, where fields of different fragments conflict with each other
+FRAGMENT_SCHEMAS = ("EHRI", "MusicBrainz", "TMDB", "TravelgateX")
+# Selections of fragments are generated within this number of levels
+FRAGMENT_DEPTH = 3
+# Metrics that are summed up over all schemas
+TIME_METRICS = ("build_schema", "construction", "first_draw")
+FACTORY_METRICS = ("factory_hits", "factory_misses", "factory_size")
+
+
+def load_sources(names: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    with open(CORPUS_PATH) as fd:
+        raw = json.load(fd)
+    selected = sorted(names) if names else sorted(set(raw) - INVALID_SCHEMAS)
+    return {name: raw[name] for name in selected}
+
+
+def measure(func: Callable[[], Any], repeat: int, setup: Optional[Callable[[], Any]] = None) -> float:
+    """Best wall time of `repeat` runs in seconds. `setup` is called before each run and is not measured."""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def construct_strategies(schema: graphql.GraphQLSchema) -> GraphQLStrategy:
+    """Build strategies for all fields of all composite types in the schema."""
+    strategy = GraphQLStrategy(schema)
+    for type_ in schema.type_map.values():
+        if isinstance(type_, (graphql.GraphQLObjectType, graphql.GraphQLInterfaceType)) and type_.fields:
+            strategy.selections(type_)
+            strategy.lists_of_fields(strategy.index.fields[type_.name])
+    return strategy
+
+
+def get_custom_scalars(schema: graphql.GraphQLSchema) -> Optional[Dict[str, st.SearchStrategy]]:
+    """Placeholders for all custom scalars, as generating their actual values is not benchmarked."""
+    custom_scalars = {
+        name: PLACEHOLDER_STRATEGY
+        for name, type_ in schema.type_map.items()
+        if name not in BUILT_IN_SCALAR_TYPE_NAMES and isinstance(type_, graphql.GraphQLScalarType)
+    }
+    return custom_scalars or None
+
+
+def draw_operations(
+    source: str, examples: int, seed: int, **options: Any
+) -> Tuple[float, float, List[str], GraphQLStrategy]:
+    """Draw operations from a fresh schema, so no strategies are reused from previous runs.
+
+    Returns the first draw latency, the time of all subsequent draws, all drawn operations, and the shared
+    `GraphQLStrategy` they were drawn with.
+    """
+    schema = graphql.build_schema(source)
+    custom_scalars = get_custom_scalars(schema)
+    start = time.perf_counter()
+    operations = generate(from_schema(schema, custom_scalars=custom_scalars, **options), examples, seed=seed)
+    first = next(operations)
+    first_draw = time.perf_counter() - start
+    # The instance shared with `from_schema`, the reference keeps it alive after drawing for its statistics
+    strategy = get_strategy(schema, custom_scalars, **options)
+    start = time.perf_counter()
+    rest = list(operations)
+    return first_draw, time.perf_counter() - start, [first, *rest], strategy
+
+
+def measure_peak_memory(func: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def keep_ast(node: graphql.DocumentNode) -> graphql.DocumentNode:
+    return node
+
+
+def measure_document_memory(source: str, examples: int, seed: int, **options: Any) -> float:
+    schema = graphql.build_schema(source)
+    strategy = from_schema(schema, custom_scalars=get_custom_scalars(schema), print_ast=keep_ast, **options)
+    # The same documents are generated twice, the first run fills all caches
+    for _ in generate(strategy, examples, seed=seed):
+        pass
+    gc.collect()
+    tracemalloc.start()
+    try:
+        documents = list(generate(strategy, examples, seed=seed))
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0] / len(documents)
+    finally:
+        tracemalloc.stop()
+
+
+def draw_fragments(source: str, examples: int, seed: int) -> Optional[float]:
+    """Draw selections of all unions and interfaces with implementations. Returns the number of draws per second."""
+    schema = graphql.build_schema(source)
+    strategy = GraphQLStrategy(schema, custom_scalars=get_custom_scalars(schema) or {})
+    fragment_strategies = [
+        strategy.selections_for_type(type_, depth=FRAGMENT_DEPTH)
+        for name, type_ in schema.type_map.items()
+        if (
+            isinstance(type_, graphql.GraphQLUnionType)
+            or (isinstance(type_, graphql.GraphQLInterfaceType) and strategy.index.implementations[name])
+        )
+        and not name.startswith("__")
+        and strategy.index.fits_depth(type_, FRAGMENT_DEPTH)
+    ]
+    if not fragment_strategies:
+        return None
+    # Strategies are built lazily on the first draw, it is measured separately by `first_draw`
+    for fragment_strategy in fragment_strategies:
+        next(generate(fragment_strategy, 1, seed=seed))
+    start = time.perf_counter()
+    for fragment_strategy in fragment_strategies:
+        for _ in generate(fragment_strategy, examples, seed=seed):
+            pass
+    return len(fragment_strategies) * examples / (time.perf_counter() - start)
+
+
+def bench_schema(name: str, source: str, repeat: int, examples: int, seed: int, **options: Any) -> Dict[str, Any]:
+    result: Dict[str, Any] = {
+        "schema": name,
+        "build_schema": measure(lambda: graphql.build_schema(source), repeat),
+    }
+    schema = graphql.build_schema(source)
+    # Indexes are cached per schema, they are dropped so that each run builds one as for a fresh schema
+    result["construction"] = measure(
+        lambda: construct_strategies(schema), repeat, setup=lambda: _INDEXES.pop(schema, None)
+    )
+    try:
+        first_draw, rest, operations, strategy = draw_operations(source, examples, seed, **options)
+        # Tracing slows everything down, therefore memory is measured in a separate run with the same operations
+        peak_memory = measure_peak_memory(lambda: draw_operations(source, examples, seed, **options))
+        document_memory = measure_document_memory(source, examples, seed, **options)
+    except RuntimeError as exc:
+        # Operations for some schemas can't be generated within the given limits
+        result["error"] = str(exc)
+        return result
+    result["first_draw"] = first_draw
+    result["operations_per_second"] = (len(operations) - 1) / rest if rest else None
+    result["peak_memory"] = peak_memory
+    result["document_size"] = sum(len(operation.encode("utf8")) for operation in operations) / len(operations)
+    result["document_memory"] = document_memory
+    factory_info = strategy.factory_info()
+    result["factory_hits"] = factory_info.hits
+    result["factory_misses"] = factory_info.misses
+    result["factory_size"] = factory_info.size
+    fragments_per_second = draw_fragments(source, examples, seed)
+    if fragments_per_second is not None:
+        result["fragments_per_second"] = fragments_per_second
+    return result
+
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    total: Dict[str, Any] = {
+        metric: sum(item.get(metric, 0) for item in results) for metric in TIME_METRICS + FACTORY_METRICS
+    }
+    total["peak_memory"] = max((item.get("peak_memory", 0) for item in results), default=0)
+    total["errors"] = sum(1 for item in results if "error" in item)
+    return total
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """Ratios of current metrics to the baseline ones, e.g. 1.2 means 20% larger than in the baseline."""
+    previous = {item["schema"]: item for item in baseline["results"]}
+    ratios = {}
+    for item in results:
+        old = previous.get(item["schema"])
+        if old is None:
+            continue
+        ratios[item["schema"]] = {
+            metric: value / old[metric]
+            for metric, value in item.items()
+            if isinstance(value, (int, float)) and isinstance(old.get(metric), (int, float)) and old[metric]
+        }
+    return ratios
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    schemas = parser.add_mutually_exclusive_group()
+    schemas.add_argument("--schema", action="append", dest="schemas", help="Schema names from the corpus")
+    schemas.add_argument(
+        "--fragment-schemas",
+        action="store_const",
+        const=FRAGMENT_SCHEMAS,
+        dest="schemas",
+        help="Benchmark schemas with many unions and interfaces",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs, the best one is reported")
+    parser.add_argument("--examples", type=int, default=20, help="Number of operations drawn from each schema")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for drawing operations")
+    parser.add_argument("--max-depth", type=int, help="Passed to `from_schema`")
+    parser.add_argument("--max-nodes", type=int, help="Passed to `from_schema`")
+    parser.add_argument("--output", type=pathlib.Path, help="Write results to this file instead of stdout")
+    parser.add_argument("--baseline", type=pathlib.Path, help="Results of a previous run to compare with")
+    options = parser.parse_args(args)
+    results = [
+        bench_schema(
+            name,
+            source,
+            options.repeat,
+            options.examples,
+            options.seed,
+            max_depth=options.max_depth,
+            max_nodes=options.max_nodes,
+        )
+        for name, source in load_sources(options.schemas).items()
+    ]
+    report: Dict[str, Any] = {
+        "settings": {
+            "examples": options.examples,
+            "seed": options.seed,
+            "max_depth": options.max_depth,
+            "max_nodes": options.max_nodes,
+            "graphql-core": graphql.version,
+        },
+        "results": results,
+        "total": summarize(results),
+    }
+    if options.baseline is not None:
+        report["comparison"] = compare(results, json.loads(options.baseline.read_text()))
+    if options.output is not None:
+        options.output.write_text(json.dumps(report, indent=2) + "\n")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
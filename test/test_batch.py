@@ -0,0 +1,94 @@
+import types
+
+import graphql
+import pytest
+from hypothesis import strategies as st
+
+from hypothesis_graphql import cache, from_schema, generate, generate_parallel
+from hypothesis_graphql.batch import MAX_FAILED_ATTEMPTS
+
+SCHEMA = """
+type Book {
+  title: String
+  author: Author
+}
+
+type Author {
+  name: String
+  books: [Book]
+}
+
+type Query {
+  getBooks(limit: Int): [Book]
+  getAuthors: [Author]
+}
+"""
+
+
+def test_generate(validate_operation):
+    strategy = from_schema(SCHEMA)
+    # When examples are generated in a batch
+    queries = generate(strategy, 50, seed=42)
+    # Then they should be produced lazily
+    assert isinstance(queries, types.GeneratorType)
+    queries = list(queries)
+    assert len(queries) == 50
+    # And be valid
+    parsed_schema = graphql.build_schema(SCHEMA)
+    for query in queries:
+        validate_operation(parsed_schema, query)
+    # And the same seed should lead to the same examples
+    assert list(generate(strategy, 50, seed=42)) == queries
+
+
+def test_different_seeds():
+    strategy = from_schema(SCHEMA)
+    assert list(generate(strategy, 20, seed=1)) != list(generate(strategy, 20, seed=2))
+
+
+def test_filtered_strategy():
+    # When some draws are rejected
+    strategy = st.integers(min_value=0, max_value=10).filter(lambda x: x % 2 == 0)
+    # Then they should be skipped
+    assert all(value % 2 == 0 for value in generate(strategy, 20, seed=0))
+
+
+def test_unsatisfiable():
+    strategy = st.integers().filter(lambda x: False)
+    with pytest.raises(RuntimeError, match=f"after {MAX_FAILED_ATTEMPTS} attempts"):
+        next(generate(strategy, 1, seed=0))
+
+
+def test_invalid_count():
+    with pytest.raises(ValueError, match="non-negative"):
+        next(generate(st.integers(), -1))
+
+
+@pytest.mark.parametrize("source", (SCHEMA, graphql.build_schema(SCHEMA)))
+def test_generate_parallel(source, validate_operation):
+    # When operations are generated in multiple processes
+    queries = list(generate_parallel(source, 40, seed=1, processes=2, chunk_size=5))
+    # Then they should be distinct
+    assert len(queries) == 40
+    assert len(set(queries)) == 40
+    for query in queries:
+        validate_operation(SCHEMA, query)
+    # And the output should not depend on the number of processes
+    assert list(generate_parallel(SCHEMA, 40, seed=1, processes=1, chunk_size=5)) == queries
+
+
+def test_generate_parallel_options():
+    queries = generate_parallel(cache.cached_build_schema(SCHEMA), 10, seed=1, processes=2, fields=["getAuthors"])
+    assert all("getBooks" not in query for query in queries)
+
+
+def test_generate_parallel_exhausted():
+    # When the schema has fewer distinct operations than requested
+    schema = "type Query { getValue: Boolean }"
+    # Then generation should stop once all of them are generated
+    assert list(generate_parallel(schema, 10, seed=1, processes=1)) == ["{\n  getValue\n}"]
+
+
+def test_generate_parallel_variables():
+    with pytest.raises(ValueError, match="`variables` is not supported"):
+        next(generate_parallel(SCHEMA, 10, processes=1, variables=True))
@@ -0,0 +1,117 @@
+import json
+
+import graphql
+import pytest
+
+from hypothesis_graphql import cache
+
+SCHEMA = """
+type Query {
+  getValue(arg: String = "foo"): Int
+}"""
+
+
+@pytest.fixture
+def cache_directory(tmp_path):
+    cache.set_cache_directory(tmp_path)
+    yield tmp_path
+    cache.set_cache_directory(None)
+
+
+def test_persistent_cache(cache_directory):
+    # When the persistent cache is enabled
+    built = cache.cached_build_schema(SCHEMA)
+    # Then the parsed schema should be stored on disk
+    files = list(cache_directory.iterdir())
+    assert len(files) == 1
+    # And the next build should reuse it
+    cache.registry.clear()
+    loaded = cache.cached_build_schema(SCHEMA)
+    assert loaded is not built
+    assert graphql.print_schema(loaded) == graphql.print_schema(built)
+    # Including default values in AST nodes
+    argument = loaded.query_type.fields["getValue"].args["arg"]
+    assert argument.ast_node.default_value.value == "foo"
+
+
+def test_persistent_cache_format(cache_directory):
+    built = cache.cached_build_schema(SCHEMA)
+    # When a schema is stored on disk
+    (path,) = cache_directory.iterdir()
+    # Then it is stored as plain JSON data
+    stored = json.loads(path.read_text())
+    assert stored["key"].startswith(cache.compute_fingerprint(SCHEMA))
+    assert stored["document"]["node"] == "DocumentNode"
+    # And it is restored to the same document
+    cache.registry.clear()
+    loaded = cache.cached_build_schema(SCHEMA)
+    assert loaded.ast_node == built.ast_node
+    assert loaded.query_type.ast_node == graphql.parse(SCHEMA, no_location=True).definitions[0]
+
+
+def test_corrupted_cache(cache_directory):
+    cache.cached_build_schema(SCHEMA)
+    (path,) = cache_directory.iterdir()
+    # When the stored file is corrupted
+    path.write_bytes(b"garbage")
+    cache.registry.clear()
+    # Then the schema should be rebuilt
+    built = cache.cached_build_schema(SCHEMA)
+    assert "getValue" in built.query_type.fields
+    # And the cache entry should be restored
+    assert path.read_bytes() != b"garbage"
+
+
+def test_key_mismatch(cache_directory, monkeypatch):
+    cache.cached_build_schema(SCHEMA)
+    # When the cache was created by another `graphql-core` version
+    monkeypatch.setattr(graphql, "version", "0.0.0")
+    cache.registry.clear()
+    cache.cached_build_schema(SCHEMA)
+    # Then a new entry should be created
+    assert len(list(cache_directory.iterdir())) == 2
+
+
+def test_invalid_schema(cache_directory):
+    # When the schema is invalid
+    with pytest.raises(TypeError):
+        cache.cached_build_schema("type Query { field: Unknown }")
+    # Then nothing should be stored
+    assert not list(cache_directory.iterdir())
+
+
+def test_disabled_by_default():
+    assert cache.get_cache_directory() is None
+
+
+def test_registry_fingerprint():
+    registry = cache.SchemaRegistry(maxsize=2)
+    fingerprint = cache.compute_fingerprint(SCHEMA)
+    # When a precomputed fingerprint is passed
+    built = registry.get(SCHEMA, lambda *_: graphql.build_schema(SCHEMA), fingerprint)
+    # Then it should be used as the key
+    assert registry.get("", pytest.fail, fingerprint) is built
+    # And equal sources should lead to the same schema
+    assert registry.get("".join(SCHEMA), pytest.fail) is built
+    info = registry.info()
+    assert (info.hits, info.misses, info.size) == (2, 1, 1)
+    assert registry.memory_usage() == len(SCHEMA)
+
+
+def test_registry_eviction():
+    registry = cache.SchemaRegistry(maxsize=2)
+    for idx in range(3):
+        registry.get(f"type Query {{ field{idx}: Int }}", lambda source, _: graphql.build_schema(source))
+    # Then the least recently used schema should be evicted
+    assert len(registry) == 2
+    assert registry.info().evictions == 1
+
+
+def test_client_schema_registry():
+    introspection = graphql.introspection_from_schema(graphql.build_schema(SCHEMA))
+    # When an introspection result is passed as a dictionary and as bytes
+    built = cache.cached_build_client_schema(introspection)
+    # Then it should be built only once
+    assert cache.cached_build_client_schema(json.loads(json.dumps(introspection))) is built
+    raw = json.dumps(introspection, sort_keys=True).encode("utf8")
+    assert cache.cached_build_client_schema(raw) is built
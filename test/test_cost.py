@@ -0,0 +1,123 @@
+import re
+
+import pytest
+from hypothesis import find, given, settings
+from hypothesis import strategies as st
+from hypothesis.errors import InvalidArgument
+
+from hypothesis_graphql import from_schema, printers, queries
+from hypothesis_graphql.cost import CostModel, compute_cost
+
+SCHEMA = """
+interface Node {
+  id: ID
+}
+type Book implements Node {
+  id: ID
+  title: String
+  author: Author
+}
+type Author implements Node {
+  id: ID
+  name: String
+  books(first: Int, after: String): [Book]
+}
+union Item = Book | Author
+type Query {
+  books(limit: Int = 10): [Book]
+  author(id: ID!): Author
+  node: Node
+  items: [Item]
+  search(text: String): [Book]
+}
+type Mutation {
+  addBook(title: String): Book
+}
+"""
+
+
+@pytest.mark.parametrize(
+    "query, model, expected",
+    (
+        ("{ author(id: 1) { name } }", None, 2),
+        ("{ author(id: 1) { name books(first: 5) { title } } }", None, 8),
+        ("{ author(id: 1) { books(first: 0) { title } } }", None, 2),
+        # The default value of the argument is used
+        ("{ books { title } }", None, 11),
+        ("{ books(limit: 2) { title author { name } } }", None, 7),
+        # `null` doesn't define the size, the list is expected to have `default_list_size` items
+        ("{ books(limit: null) { title } }", None, 2),
+        ("{ author(id: 1) { books { title } } }", CostModel(default_list_size=3), 5),
+        ('{ search(text: "a") { title } }', CostModel(weights={"Query.search": 10}), 11),
+        ("{ author(id: 1) { name } }", CostModel(default_weight=2), 4),
+        ('{ author(id: 1) { books(after: "x", first: 2) { title } } }', CostModel(list_size_arguments=["after"]), 3),
+        # Inline fragments add up, `__typename` is free
+        ("{ node { id ... on Book { title } ... on Author { name } __typename } }", None, 4),
+        ("{ items { ... on Book { title } ... on Author { name } } }", None, 3),
+        ('mutation { addBook(title: "A") { id } }', None, 2),
+        ("query A { node { id } } query B { node { id } }", None, 4),
+    ),
+)
+def test_compute_cost(query, model, expected):
+    assert compute_cost(query, SCHEMA, model) == expected
+
+
+def test_cost_model_hashable():
+    # Models with the same weights are equal regardless of their order
+    assert CostModel(weights={"A.a": 1, "B.b": 2}) == CostModel(weights=[("B.b", 2), ("A.a", 1)])
+    assert hash(CostModel(weights={"A.a": 1})) == hash(CostModel(weights={"A.a": 1}))
+    assert CostModel(weights={"A.a": 1}).weight("A", "a") == 1
+    assert CostModel(weights={"A.a": 1}).weight("A", "b") == 1
+    assert CostModel(weights={"A.a": 0}).min_weight() == 0
+
+
+@pytest.mark.parametrize("max_cost", (2, 5, 30))
+@given(data=st.data())
+def test_max_cost(data, validate_operation, max_cost):
+    query = data.draw(queries(SCHEMA, max_cost=max_cost))
+    validate_operation(SCHEMA, query)
+    assert compute_cost(query, SCHEMA) <= max_cost
+
+
+@given(data=st.data())
+def test_max_cost_weights(data, validate_operation):
+    # When a field is more expensive than allowed
+    model = CostModel(weights={"Query.search": 100, "Author.books": 0}, default_list_size=2)
+    query = data.draw(from_schema(SCHEMA, cost_model=model, max_cost=20))
+    validate_operation(SCHEMA, query)
+    # Then it is never selected
+    assert "search" not in query
+    assert compute_cost(query, SCHEMA, model) <= 20
+
+
+def test_max_cost_list_size_siblings():
+    schema = """
+type Item { a: Int b: Int c: Int }
+type Query { items(first: Int): [Item] other: Item }
+"""
+
+    def condition(query):
+        match = re.match(r"\{items\(first:(\d+)\)\{[a-c]\} other\{[a-c] [a-c] [a-c]\}\}$", query)
+        return match is not None and int(match.group(1)) >= 4
+
+    # When a list size divides the budget for sub-selections of a field
+    strategy = queries(schema, max_cost=9, print_ast=printers.print_compact)
+    # Then the rest of it is still available for the following siblings
+    query = find(strategy, condition, settings=settings(max_examples=2000))
+    assert compute_cost(query, schema) == 9
+
+
+def test_max_cost_too_small():
+    with pytest.raises(InvalidArgument, match="No fields of the `Query` type could be generated with `max_cost=5`"):
+        queries(SCHEMA, fields=["search"], cost_model=CostModel(weights={"Query.search": 10}), max_cost=5)
+
+
+@pytest.mark.parametrize("value", (0, -1, 1.5))
+def test_invalid_max_cost(value):
+    with pytest.raises(InvalidArgument, match="`max_cost` should be a positive integer"):
+        queries(SCHEMA, max_cost=value)
+
+
+def test_invalid_cost_model():
+    with pytest.raises(InvalidArgument, match="`cost_model` should be an instance of `CostModel`"):
+        queries(SCHEMA, cost_model={"Query.search": 10})
@@ -5,7 +5,11 @@ from hypothesis import find, given
 from hypothesis import strategies as st
 from hypothesis.errors import InvalidArgument
 
-from hypothesis_graphql import nodes, queries
+from hypothesis_graphql import from_schema, mutations, nodes, printers, queries
+from hypothesis_graphql._strategies.index import get_index
+from hypothesis_graphql._strategies.strategy import BUILT_IN_SCALAR_TYPE_NAMES
+from hypothesis_graphql.cache import cached_build_schema
+from hypothesis_graphql.types import CustomScalars
 
 CUSTOM_SCALAR_TEMPLATE = """
 scalar Date
@@ -65,16 +69,115 @@ def test_custom_scalar_argument_nullable(validate_operation):
 
 
 @pytest.mark.parametrize("input_type", ("Date", "RequiredQueryInput"))
-@given(data=st.data())
-def test_custom_scalar_argument(data, input_type):
+def test_custom_scalar_argument(input_type):
     # When a custom scalar type is defined
     # And is used in an argument position
     # And is not nullable
 
     schema = CUSTOM_SCALAR_TEMPLATE.format(query=f"getByDate(created: {input_type}!): Object")
 
-    with pytest.raises(TypeError, match="Scalar 'Date' is not supported"):
-        data.draw(queries(schema))
+    # Then the field is excluded and the error is raised when the strategy is created, together with the reason
+    with pytest.raises(
+        InvalidArgument,
+        match=re.escape(
+            "No fields of the `Query` type could be generated. Excluded fields:\n"
+            "  - `Query.getByDate`: The `created` argument can't be generated. Scalar 'Date' is not supported"
+        ),
+    ):
+        queries(schema)
+
+
+@given(data=st.data())
+def test_custom_scalar_argument_excluded(data, validate_operation):
+    # When a field has a required argument of a custom scalar type
+    # And there are other fields
+    schema = CUSTOM_SCALAR_TEMPLATE.format(
+        query="""getByDate(created: Date!): Object
+  getByInput(input: RequiredQueryInput!): Object
+  getObject: Object"""
+    )
+    query = data.draw(queries(schema))
+    validate_operation(schema, query)
+    # Then fields that can't be generated are never selected
+    assert "getBy" not in query
+
+
+@pytest.mark.parametrize(
+    "schema, expected",
+    (
+        # The reason is propagated from nested required fields
+        (
+            """scalar Date
+input Inner { created: Date! }
+input Outer { inner: Inner! }
+type Query { getOuter(input: Outer!): Int getOptional(input: Outer): Int getInt: Int }""",
+            {
+                "getOuter": "The `input` argument can't be generated. Scalar 'Date' is not supported. "
+                "Provide a Hypothesis strategy via the `custom_scalars` argument to generate it."
+            },
+        ),
+        # All fields of an object type are excluded, then the fields of that type are excluded too
+        (
+            """scalar Date
+type Object { byDate(created: Date!): Int }
+union Item = Object
+type Query { getObject: Object getItem: Item getInt: Int }""",
+            {
+                "getObject": "The `Object` type has no fields that could be generated",
+                "getItem": "The `Item` type has no fields that could be generated",
+            },
+        ),
+    ),
+    ids=("nested-input", "empty-type"),
+)
+@given(data=st.data())
+def test_excluded_fields(data, validate_operation, schema, expected):
+    # When fields can't be generated
+    index = get_index(cached_build_schema(schema), BUILT_IN_SCALAR_TYPE_NAMES)
+    # Then they are excluded together with the reason
+    assert index.excluded_fields["Query"] == expected
+    # And are never selected
+    query = data.draw(queries(schema))
+    validate_operation(schema, query)
+    for name in expected:
+        assert name not in query
+
+
+@pytest.mark.parametrize(
+    "field, expected",
+    (
+        ("a", "{\n  a(x: {children: [], name: null})\n}"),
+        ("c", "{\n  c(y: {dates: []}, z: [])\n}"),
+    ),
+)
+def test_required_lists(validate_operation, field, expected):
+    schema = """
+scalar Date
+
+input A {
+  children: [A!]!
+  name: String
+}
+
+input B {
+  dates: [Date!]!
+}
+
+type Query {
+  a(x: A!): Int
+  b: Int
+  c(y: B!, z: [Date!]!): Int
+}"""
+    # When a required field or argument is a list of a self-referential input type or an unsupported scalar
+    strategy = queries(schema, fields=[field])
+
+    @given(strategy)
+    def test(query):
+        validate_operation(schema, query)
+
+    test()
+    # Then it is not excluded, as the list could be empty
+    assert find(strategy, lambda x: True) == expected
 
 
 @pytest.mark.parametrize("other_type", ("String!", "String"))
@@ -165,3 +268,40 @@ def test_invalid_custom_scalar_strategy(custom_scalars, expected):
     schema = CUSTOM_SCALAR_TEMPLATE.format(query="getByDate(created: Date!): Int")
     with pytest.raises(InvalidArgument, match=expected):
         queries(schema, custom_scalars=custom_scalars)
+
+
+def test_invalid_custom_scalars_type():
+    schema = CUSTOM_SCALAR_TEMPLATE.format(query="getByDate(created: Date!): Int")
+    with pytest.raises(InvalidArgument, match="`custom_scalars` should be a mapping"):
+        queries(schema, custom_scalars=[("Date", st.just(nodes.String("x")))])
+
+
+@pytest.mark.parametrize("func", (queries, mutations, from_schema))
+def test_same_arguments_same_strategy(func):
+    # When the same arguments are passed in different forms
+    schema = CUSTOM_SCALAR_TEMPLATE.format(query="getByDate(created: Date!): Int") + "type Mutation { m: Int }"
+    date = st.just("2000-01-01").map(nodes.String)
+    first = func(schema, custom_scalars={"Date": date})
+    # Then the same strategy is returned
+    assert func(schema, custom_scalars={"Date": date}) is first
+    assert func(schema, custom_scalars=CustomScalars({"Date": date})) is first
+    assert func(schema, custom_scalars={"Date": date}, print_ast=printers.print_ast) is first
+    assert func(schema, custom_scalars={"Date": date}, fields=None) is first
+    # And different arguments lead to different strategies
+    assert func(schema, custom_scalars={"Date": st.just("2000-01-02").map(nodes.String)}) is not first
+    fields = ["m"] if func is mutations else ["getByDate"]
+    assert func(schema, custom_scalars={"Date": date}, fields=fields) is func(
+        schema, custom_scalars={"Date": date}, fields=tuple(fields)
+    )
+
+
+def test_custom_scalars_mapping():
+    date = st.just("2000-01-01").map(nodes.String)
+    scalars = CustomScalars({"Date": date})
+    assert scalars == CustomScalars([("Date", date)]) == {"Date": date}
+    assert hash(scalars) == hash(CustomScalars({"Date": date}))
+    assert dict(scalars) == {"Date": date}
+    assert len(scalars) == 1
+    assert scalars["Date"] is date
+    with pytest.raises(TypeError):
+        scalars["Date"] = date
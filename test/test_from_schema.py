@@ -1,9 +1,14 @@
+import gc
+import weakref
+
+import graphql
 import pytest
-from hypothesis import given
+from hypothesis import find, given
 from hypothesis import strategies as st
 from hypothesis.errors import InvalidArgument
 
-from hypothesis_graphql import from_schema
+from hypothesis_graphql import from_schema, mutations, nodes, queries
+from hypothesis_graphql._strategies.strategy import get_strategy
 
 QUERY = """type Query {
   getBooks: [Book]
@@ -44,3 +49,48 @@ def test_from_schema(data, schema, validate_operation, types, available_fields):
 def test_no_query_no_mutation(schema, validate_operation):
     with pytest.raises(InvalidArgument, match="Query or Mutation type must be provided"):
         from_schema(schema)
+
+
+def test_shared_strategy(schema):
+    # When strategies are created for the same schema via different entry points
+    parsed = graphql.build_schema(f"{schema}\n{QUERY}\n{MUTATION}")
+    first = get_strategy(parsed)
+    from_schema(parsed)
+    queries(parsed, fields=["getBooks"])
+    # Then they should use the same `GraphQLStrategy` instance
+    assert get_strategy(parsed) is first
+    # Unless custom scalars are different
+    assert get_strategy(parsed, {"Date": st.just("foo").map(nodes.String)}) is not first
+
+
+def test_shared_strategy_lifecycle(schema):
+    parsed = graphql.build_schema(f"{schema}\n{QUERY}")
+    reference = weakref.ref(parsed)
+    strategy = get_strategy(parsed).selections(parsed.query_type)
+    # When the schema is referenced only by strategies built for it
+    del parsed
+    gc.collect()
+    # Then it should be kept alive
+    assert get_strategy(reference()).selections(reference().query_type) is strategy
+    # And when these strategies are not referenced anymore
+    del strategy
+    gc.collect()
+    # Then the schema should be garbage collected
+    assert reference() is None
+
+
+def test_lazy_roots(schema):
+    parsed = graphql.build_schema(f"{schema}\n{QUERY}\n{MUTATION}")
+    strategy = from_schema(parsed)
+    shared = get_strategy(parsed)
+    # When no operations are drawn yet
+    # Then strategies for root types are not built
+    assert shared._cache.get(("root_selections", ("Query", None))) is None
+    assert shared._cache.get(("root_selections", ("Mutation", None))) is None
+    # And they are built once the root type is drawn
+    assert find(strategy, lambda operation: operation.startswith("mutation")).startswith("mutation")
+    root_selections = shared._cache.get(("root_selections", ("Mutation", None)))
+    assert root_selections is not None
+    # And reused by other entry points
+    mutations(parsed)
+    assert get_strategy(parsed).root_selections(parsed.mutation_type) is root_selections
@@ -0,0 +1,133 @@
+import graphql
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+from hypothesis.errors import InvalidArgument
+
+from hypothesis_graphql import from_schema, mutations, queries
+from hypothesis_graphql._strategies.index import get_index
+from hypothesis_graphql._strategies.strategy import count_nodes
+from hypothesis_graphql.cache import cached_build_schema
+
+QUERY = """
+type Query {
+  getBooks: [Book]
+  getAuthors: [Author]
+  getModel: Node
+  getMedia: Media
+}"""
+
+
+def get_selections(query):
+    return graphql.parse(query).definitions[0].selection_set.selections
+
+
+def get_depth(selections):
+    # Inline fragments don't add a level
+    depth = 1
+    for item in selections:
+        if isinstance(item, graphql.InlineFragmentNode):
+            depth = max(depth, get_depth(item.selection_set.selections))
+        elif item.selection_set:
+            depth = max(depth, 1 + get_depth(item.selection_set.selections))
+    return depth
+
+
+def get_max_breadth(selections):
+    return max(
+        [len(selections)]
+        + [get_max_breadth(item.selection_set.selections) for item in selections if item.selection_set]
+    )
+
+
+@pytest.mark.parametrize("max_depth", (1, 2, 3))
+@given(data=st.data())
+def test_max_depth(data, schema, validate_operation, max_depth):
+    schema += "type Query { getBooks: [Book] getModel: Node getValue: Int }"
+    query = data.draw(queries(schema, max_depth=max_depth))
+    validate_operation(schema, query)
+    assert get_depth(get_selections(query)) <= max_depth
+
+
+@given(data=st.data())
+def test_max_fields_per_selection(data, schema, validate_operation):
+    schema += QUERY
+    query = data.draw(queries(schema, max_fields_per_selection=2))
+    validate_operation(schema, query)
+    assert get_max_breadth(get_selections(query)) <= 2
+
+
+@pytest.mark.parametrize("max_fields_per_selection", (1, 2, 3))
+@given(data=st.data())
+def test_max_fields_per_selection_interface(data, validate_operation, max_fields_per_selection):
+    # When an interface has several fields and implementations
+    schema = """
+interface Node {
+  a: Int
+  b: Int
+  c: Node
+}
+type First implements Node {
+  a: Int
+  b: Int
+  c: Node
+  d: Int
+}
+type Second implements Node {
+  a: Int
+  b: Int
+  c: Node
+  e: Int
+}
+type Query {
+  node: Node
+}"""
+    query = data.draw(queries(schema, max_fields_per_selection=max_fields_per_selection, max_depth=4))
+    validate_operation(schema, query)
+    # Then its fields and inline fragments share the limit on every level
+    assert get_max_breadth(get_selections(query)) <= max_fields_per_selection
+
+
+@pytest.mark.parametrize("max_nodes", (3, 10))
+@given(data=st.data())
+def test_max_nodes(data, schema, validate_operation, max_nodes):
+    schema += QUERY
+    query = data.draw(queries(schema, max_nodes=max_nodes, max_depth=4))
+    validate_operation(schema, query)
+    selections = get_selections(query)
+    assert count_nodes(selections) <= max_nodes
+    assert get_depth(selections) <= 4
+
+
+def test_min_costs(schema):
+    index = get_index(cached_build_schema(schema + QUERY))
+    # `getBooks { title }`
+    assert index.min_depths["Query"] == 2
+    assert index.min_field_nodes["Query"] == 2
+    # `id ... on Model { int }`
+    assert index.min_nodes["Node"] == 3
+    assert index.min_nodes["Media"] == 2
+
+
+def test_max_depth_too_small(schema):
+    with pytest.raises(InvalidArgument, match="No fields of the `Query` type could be generated with `max_depth=1`"):
+        queries(schema + QUERY, max_depth=1)
+
+
+@given(data=st.data())
+def test_max_depth_skipped_root(data, schema, validate_operation):
+    # When only some root types could be generated within `max_depth`
+    schema += "type Query { getValue: Int }type Mutation { addBook(title: String): Book }"
+    query = data.draw(from_schema(schema, max_depth=1))
+    # Then others should be skipped
+    validate_operation(schema, query)
+    assert query.startswith("{")
+    with pytest.raises(InvalidArgument):
+        mutations(schema, max_depth=1)
+
+
+@pytest.mark.parametrize("name", ("max_depth", "max_fields_per_selection", "max_nodes", "cache_size"))
+@pytest.mark.parametrize("value", (0, -1, 1.5, True))
+def test_invalid_limits(schema, name, value):
+    with pytest.raises(InvalidArgument, match=f"`{name}` should be a positive integer"):
+        queries(schema + QUERY, **{name: value})
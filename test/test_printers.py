@@ -0,0 +1,100 @@
+import graphql
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from hypothesis_graphql import from_schema, nodes, printers
+
+SCHEMA = """
+scalar Date
+
+interface Node {
+  id: ID!
+}
+
+type Image implements Node {
+  id: ID!
+  path(size: Int, format: String): String
+}
+
+type Video implements Node {
+  id: ID!
+  duration: Float
+}
+
+union Media = Image | Video
+
+input Filter {
+  tags: [String!]
+  created: Date
+  nested: Filter
+}
+
+type Query {
+  node: Node
+  media(filter: Filter, limit: Int, includeDeletedAndArchivedItemsFromAllSources: Boolean): [Media]
+}
+
+type Mutation {
+  upload(path: String!, created: Date): Image
+}
+"""
+CUSTOM_SCALARS = {
+    "Date": st.sampled_from(
+        [
+            nodes.String("2022-01-01"),
+            graphql.StringValueNode(value="multi\nline", block=True),
+            graphql.VariableNode(name=graphql.NameNode(value="date")),
+        ]
+    )
+}
+
+
+@given(from_schema(SCHEMA, custom_scalars=CUSTOM_SCALARS, print_ast=lambda node: node))
+def test_same_as_graphql(document):
+    # Generated documents should be printed the same way as `graphql.print_ast` does
+    assert printers.print_ast(document) == graphql.print_ast(document)
+
+
+@given(from_schema(SCHEMA, custom_scalars=CUSTOM_SCALARS, print_ast=lambda node: node))
+def test_compact(document):
+    # Compact documents should have the same AST as the original ones
+    printed = printers.print_compact(document)
+    assert "\n  " not in printed
+    assert graphql.print_ast(graphql.parse(printed)) == graphql.print_ast(document)
+
+
+@given(from_schema(SCHEMA, custom_scalars=CUSTOM_SCALARS, print_ast=lambda node: node, variables=True))
+def test_variables(operation):
+    # Operations with variable definitions are printed directly too
+    document, _ = operation
+    assert printers.print_ast(document) == graphql.print_ast(document)
+    assert graphql.print_ast(graphql.parse(printers.print_compact(document))) == graphql.print_ast(document)
+
+
+def test_compact_sorted():
+    document = graphql.parse('{ field(b: {z: 1, y: [true]}, a: "x") { ... on Image { id } id } }')
+    assert printers.print_compact(document) == '{field(b:{z:1,y:[true]},a:"x"){...on Image{id} id}}'
+    assert printers.print_compact_sorted(document) == '{field(a:"x",b:{y:[true],z:1}){...on Image{id} id}}'
+
+
+@given(from_schema(SCHEMA, custom_scalars=CUSTOM_SCALARS, print_ast=printers.print_compact_sorted))
+def test_compact_as_printer(query):
+    graphql.parse(query)
+
+
+@pytest.mark.parametrize(
+    "source",
+    (
+        "query Named { field }",
+        "query ($id: ID) { field(id: $id) }",
+        "query ($id: ID = 1) { field(id: $id) }",
+        "fragment Frag on Query { field }",
+        "{ field(arg: {}, list: []) { ... on Image { path } } }",
+        "{ field { ...Frag } }",
+    ),
+)
+@pytest.mark.parametrize("printer", (printers.print_ast, printers.print_compact))
+def test_delegated_nodes(source, printer):
+    document = graphql.parse(source)
+    assert graphql.print_ast(graphql.parse(printer(document))) == graphql.print_ast(document)
@@ -1,3 +1,5 @@
+import json
+
 import graphql
 import pytest
 from graphql import GraphQLNamedType
@@ -6,8 +8,17 @@ from hypothesis import strategies as st
 from hypothesis.errors import InvalidArgument
 
 from hypothesis_graphql import nodes, queries
-from hypothesis_graphql._strategies.strategy import GraphQLStrategy
+from hypothesis_graphql._strategies.aliases import add_aliases
+from hypothesis_graphql._strategies.ast import make_query
+from hypothesis_graphql._strategies.index import get_index
+from hypothesis_graphql._strategies.strategy import (
+    DEFAULT_CACHE_SIZE,
+    GraphQLStrategy,
+    add_fragment_aliases,
+    get_strategy,
+)
 from hypothesis_graphql.cache import cached_build_schema
+from hypothesis_graphql.printers import print_compact
 
 
 @pytest.fixture(scope="session")
@@ -205,6 +216,28 @@ def test_no_surrogates(data, validate_operation):
     value.encode("utf8")
 
 
+@given(data=st.data())
+def test_lean_nodes(data, schema, validate_operation):
+    schema += "type Query { getBooks(title: String): [Book] getModel: Model getNode: Node }"
+    document = data.draw(queries(schema, print_ast=lambda node: node))
+    validate_operation(schema, graphql.print_ast(document))
+    names = {}
+
+    def check(selections):
+        for selection in selections:
+            if isinstance(selection, graphql.FieldNode):
+                # Then name nodes are shared between fields with the same name
+                assert names.setdefault(("field", selection.name.value), selection.name) is selection.name
+                for argument in selection.arguments:
+                    assert names.setdefault(("argument", argument.name.value), argument.name) is argument.name
+                # And leaf fields have no selection set
+                if selection.selection_set is None:
+                    continue
+            check(selection.selection_set.selections)
+
+    check(document.definitions[0].selection_set.selections)
+
+
 ALIASES_INTERFACE_TWO_TYPES = """interface Conflict {
   id: ID
 }
@@ -362,6 +395,63 @@ def test_aliases(data, validate_operation, schema):
     validate_operation(schema, query)
 
 
+@pytest.mark.parametrize(
+    "query, expected",
+    (
+        ("{a{b(x:1) ...on A{b(x:2)}}}", "{a{b(x:1) ...on A{b_1:b(x:2)}}}"),
+        # Fields with the same name on different levels are aliased too, as their parents could be merged
+        ("{a{c{b(x:1)} ...on A{c{b(x:2)}}}}", "{a{c{b(x:1)} ...on A{c{b_1:b(x:2)}}}}"),
+        # Aliases are unique even if fields have different arguments
+        ("{a{b(x:1) ...on A{b(y:2)} ...on B{b(x:3)}}}", "{a{b(x:1) ...on A{b_1:b(y:2)} ...on B{b_2:b(x:3)}}}"),
+        # Top-level fields have separate scopes
+        ("{a{b(x:1)} c{b(x:2)}}", "{a{b(x:1)} c{b(x:2)}}"),
+        ("{a{b c}}", "{a{b c}}"),
+    ),
+)
+def test_add_aliases(query, expected):
+    document = graphql.parse(query)
+    selections = document.definitions[0].selection_set.selections
+    resolved = add_aliases(selections)
+    assert print_compact(make_query(resolved)) == expected
+    # Then the original document is not modified
+    assert print_compact(document) == query
+    # And unchanged subtrees are shared
+    if query == expected:
+        assert resolved is selections
+    else:
+        assert resolved[0] is not selections[0]
+
+
+def test_add_aliases_fields():
+    # When only some top-level fields may contain conflicting fields
+    selections = (
+        graphql.parse("{a{b(x:1) ...on A{b(x:2)}} c{b(x:1) ...on A{b(x:2)}}}").definitions[0].selection_set.selections
+    )
+    resolved = add_aliases(selections, fields={"c"})
+    # Then other fields are not processed
+    assert resolved[0] is selections[0]
+    assert print_compact(make_query(resolved)) == "{a{b(x:1) ...on A{b(x:2)}} c{b(x:1) ...on A{b_1:b(x:2)}}}"
+
+
+@pytest.mark.parametrize(
+    "schema, expected",
+    (
+        # Fields with arguments are reachable from an interface with implementations.
+        # Selections on implementations themselves contain no fragments
+        (ALIASES_ARGUMENT_STRING, {"Conflict", "Query"}),
+        (ALIASES_INTERFACE_NESTED_TYPE, {"Conflict", "Query"}),
+        # Fragments are generated, but there are no fields with arguments to conflict
+        (ALIASES_INTERFACE_TWO_TYPES, set()),
+        (ALIASES_UNION_RETURN_TYPE, set()),
+        # Fields with arguments, but no fragments
+        ("type Query { a(x: Int): Query b: Int }", set()),
+    ),
+    ids=("argument-string", "interface-nested-type", "interface-two-types", "union", "no-fragments"),
+)
+def test_index_alias_types(schema, expected):
+    assert get_index(cached_build_schema(schema)).alias_types == expected
+
+
 def test_custom_printer(simple_schema):
     def printer(node):
         return str(node)
@@ -475,3 +565,170 @@ type Query {
     # And then schema validation should fail instead
     with pytest.raises(TypeError, match="Type Empty must define one or more fields"):
         validate_operation(schema, query)
+
+
+@pytest.mark.parametrize(
+    "as_introspection",
+    (
+        lambda schema: graphql.introspection_from_schema(schema),
+        lambda schema: {"data": graphql.introspection_from_schema(schema)},
+        lambda schema: json.dumps(graphql.introspection_from_schema(schema)).encode("utf8"),
+    ),
+    ids=("dict", "response", "bytes"),
+)
+@given(data=st.data())
+def test_introspection_result(data, simple_schema, validate_operation, as_introspection):
+    # When the schema is passed as an introspection result
+    introspection = as_introspection(cached_build_schema(simple_schema))
+    query = data.draw(queries(introspection))
+    # Then it should be used directly
+    validate_operation(simple_schema, query)
+
+
+def test_introspection_default_values():
+    # When the schema is built from an introspection result
+    schema = graphql.build_schema(
+        """
+input InputData {
+  inner: [String!] = ["foo"]
+}
+
+type Query {
+  getValue(arg: InputData): Int!
+}"""
+    )
+    strategy = queries(graphql.introspection_from_schema(schema))
+    # Then default values should still be used
+    find(strategy, lambda query: '["foo"]' in query)
+
+
+@pytest.mark.parametrize(
+    "schema, type_names, expected",
+    (
+        (ALIASES_INTERFACE_TWO_TYPES, ("FloatModel", "StringModel"), [{}, {"query": "query_NonNullString"}]),
+        (ALIASES_INTERFACE_THREE_TYPES, ("First", "Second"), [{}, {}]),
+        # Only fields that differ from the first field with the same name get aliases
+        (
+            ALIASES_INTERFACE_THREE_TYPES,
+            ("Third", "First", "Second"),
+            [{}, {"key": "key_String"}, {"key": "key_String"}],
+        ),
+        (ALIASES_ARGUMENT_STRING, ("FirstModel", "SecondModel"), [{}, {}]),
+    ),
+)
+def test_index_fragment_aliases(schema, type_names, expected):
+    index = get_index(cached_build_schema(schema))
+    aliases = index.fragment_aliases(type_names)
+    assert [{name: alias.value for name, alias in item.items()} for item in aliases] == expected
+
+
+def test_fragment_aliases_copy_nodes():
+    fragment = graphql.parse("{ ... on Model { id query } }").definitions[0].selection_set.selections[0]
+    # When fields in a fragment get aliases
+    aliased = add_fragment_aliases({"query": graphql.NameNode(value="query_String")}, fragment)
+    # Then they are copied, as generated nodes could be shared between examples
+    assert print_compact.inline_fragment(aliased, 0) == "...on Model{id query_String:query}"
+    assert print_compact.inline_fragment(fragment, 0) == "...on Model{id query}"
+    # And fields without aliases are reused
+    assert aliased.selection_set.selections[0] is fragment.selection_set.selections[0]
+    # And fragments without aliased fields are returned as is
+    assert add_fragment_aliases({"other": graphql.NameNode(value="other_String")}, fragment) is fragment
+
+
+def test_index_names(schema):
+    index = get_index(cached_build_schema(schema + "type Query { getModel(id: ID, input: QueryInput): Model }"))
+    # Every type, field, argument and input field name has a shared node
+    for name in ("Model", "Media", "getModel", "id", "input", "eq"):
+        assert index.names[name].value == name
+    # Type conditions exist only for object types and reuse the same name nodes
+    assert index.named_types["Model"].name is index.names["Model"]
+    assert "Media" not in index.named_types
+
+
+def test_bounded_strategy_cache(simple_schema):
+    # When the strategy cache is bounded
+    strategy = GraphQLStrategy(cached_build_schema(simple_schema), cache_size=2)
+    schema = strategy.schema
+    book, author = schema.type_map["Book"], schema.type_map["Author"]
+    first = strategy.selections(book)
+    assert strategy.selections(book) is first
+    strategy.selections(author)
+    strategy.selections(schema.query_type)
+    # Then least recently used strategies should be evicted
+    assert strategy.selections(book) is not first
+    info = strategy.cache_info()
+    assert (info.hits, info.misses, info.evictions, info.size, info.maxsize) == (1, 4, 2, 2, 2)
+
+
+@given(data=st.data())
+def test_bounded_strategy_cache_entry_points(data, simple_schema, validate_operation):
+    schema = cached_build_schema(simple_schema)
+    # When the cache size is passed to an entry point
+    query = data.draw(queries(schema, cache_size=3))
+    validate_operation(schema, query)
+    # Then the shared strategy has a bounded cache
+    info = get_strategy(schema, cache_size=3).cache_info()
+    assert info.maxsize == 3
+    assert info.size <= 3
+    # And it is bounded by default as well
+    assert get_strategy(schema).cache_info().maxsize == DEFAULT_CACHE_SIZE
+
+
+def test_values_strategy_cache():
+    schema = cached_build_schema("enum Color { RED GREEN } type Query { a(x: Int, c: Color = RED): Int }")
+    strategy = GraphQLStrategy(schema)
+    int_type, color = schema.type_map["Int"], schema.type_map["Color"]
+    default = nodes.Enum("RED")
+    # Value strategies are cached per type and default value
+    assert strategy.values(int_type) is strategy.values(int_type)
+    assert strategy.values(color, default) is strategy.values(color, graphql.EnumValueNode(value="RED"))
+    assert strategy.values(color, default) is not strategy.values(color)
+    assert strategy.values(graphql.GraphQLNonNull(int_type)) is not strategy.values(int_type)
+    # And they are not shared between strategies
+    assert GraphQLStrategy(schema).values(int_type) is not strategy.values(int_type)
+
+
+def test_values_strategy_cache_not_evicted(simple_schema):
+    schema = cached_build_schema(simple_schema)
+    # When the strategy cache is bounded
+    strategy = GraphQLStrategy(schema, cache_size=1)
+    int_type = schema.type_map["Int"]
+    first = strategy.values(int_type)
+    strategy.selections(schema.type_map["Book"])
+    strategy.selections(schema.type_map["Author"])
+    # Then value strategies are kept in their own table and are not evicted by other strategies
+    assert strategy.values(int_type) is first
+    assert strategy.cache_info().size == 1
+    info = strategy.value_cache_info()
+    assert (info.hits, info.size, info.evictions, info.maxsize) == (1, 1, 0, None)
+
+
+def test_factory_table():
+    schema = cached_build_schema("enum Color { RED GREEN } type Query { a(c: Color): Int }")
+    strategy = GraphQLStrategy(schema)
+    table = strategy._factories
+    # Factories are created once per name
+    assert table.field("a") is table.field("a")
+    assert table.argument("a") is not table.field("a")
+    # And enum value nodes once per type
+    values = table.enum_values(schema.type_map["Color"])
+    assert [value.value for value in values] == ["RED", "GREEN"]
+    assert table.enum_values(schema.type_map["Color"]) is values
+    info = strategy.factory_info()
+    assert (info.hits, info.misses, info.evictions, info.size, info.maxsize) == (3, 3, 0, 3, None)
+    # And tables are not shared between strategies
+    assert GraphQLStrategy(schema)._factories.field("a") is not table.field("a")
+
+
+def test_arguments_strategy_cache():
+    strategy = GraphQLStrategy(cached_build_schema("scalar Date type Query { a(x: Int, y: Date): Int b(x: Int): Int }"))
+    fields = strategy.schema.query_type.fields
+    # Strategies for arguments are built once per field
+    arguments = strategy.list_of_arguments(fields["a"].args)
+    assert strategy.list_of_arguments(fields["a"].args) is arguments
+    assert strategy.list_of_arguments(fields["b"].args) is not arguments
+    # And arguments of unsupported nullable types are either `null` or skipped
+    assert [node.name.value for node in find(arguments, lambda x: len(x) == 1)] == ["x"]
+    x, y = find(arguments, lambda x: len(x) == 2)
+    assert y.name.value == "y"
+    assert y.value is nodes.Null
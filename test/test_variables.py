@@ -0,0 +1,194 @@
+import json
+
+import graphql
+import pytest
+from graphql.execution.values import get_variable_values
+from hypothesis import find, given
+from hypothesis import strategies as st
+from hypothesis.errors import InvalidArgument
+
+from hypothesis_graphql import from_schema, mutations, nodes, printers, queries
+from hypothesis_graphql._strategies.variables import extract_variables
+from hypothesis_graphql.cache import cached_build_schema
+
+SCHEMA = """
+scalar Date
+
+enum Color {
+  RED
+  GREEN
+}
+
+input Filter {
+  color: Color
+  tags: [String!]
+  created: Date
+  nested: Filter
+}
+
+interface Node {
+  id: ID!
+}
+
+type Book implements Node {
+  id: ID!
+  title(short: Boolean): String
+  related(first: Int!, filter: Filter): [Book]
+}
+
+type Author implements Node {
+  id: ID!
+  books(first: Int!, filter: Filter): [Book]
+}
+
+type Query {
+  node(id: ID!): Node
+  books(first: Int = 10, filter: Filter): [Book]
+}
+
+type Mutation {
+  addBook(title: String!, created: Date): Book
+}
+"""
+CUSTOM_SCALARS = {"Date": st.just("2000-01-01").map(nodes.String)}
+
+
+def validate_variables(schema, query, variables):
+    parsed_schema = cached_build_schema(schema)
+    document = graphql.parse(query)
+    assert not graphql.validate(parsed_schema, document), query
+    # Variables are JSON-compatible
+    variables = json.loads(json.dumps(variables))
+    definitions = document.definitions[0].variable_definitions or ()
+    coerced = get_variable_values(parsed_schema, definitions, variables)
+    assert isinstance(coerced, dict), coerced
+    return document
+
+
+@pytest.mark.parametrize("func", (queries, mutations, from_schema))
+@given(data=st.data())
+def test_variables(data, func):
+    # When variables mode is enabled
+    query, variables = data.draw(func(SCHEMA, custom_scalars=CUSTOM_SCALARS, variables=True))
+    # Then every argument is passed as a variable
+    document = validate_variables(SCHEMA, query, variables)
+    names = [definition.variable.name.value for definition in document.definitions[0].variable_definitions or ()]
+    assert sorted(names) == sorted(variables)
+    assert ": $" in query or not variables
+    # And the operation is valid with its variables
+    assert graphql.print_ast(document) == query
+
+
+def test_variables_same_document():
+    # When the same selections are generated with different argument values
+    strategy = queries(SCHEMA, fields=["node"], max_depth=2, variables=True)
+    first = find(strategy, lambda x: True)
+    second = find(strategy, lambda x: x[1]["id"] != first[1]["id"])
+    # Then documents are the same, and only variables differ
+    assert first[0] == second[0]
+    assert first[0].startswith("query ($id: ID!) {\n  node(id: $id) {")
+
+
+def test_variables_repeated_arguments():
+    schema = cached_build_schema(SCHEMA)
+    document = graphql.parse(
+        '{ books(first: 1, filter: {color: RED, tags: ["a"]}) { related(first: 2) { related(first: 3) { id } } } '
+        "node(id: 4) { ... on Author { books(first: 5) { id } } __typename } }"
+    )
+    selections = document.definitions[0].selection_set.selections
+    extracted, definitions, variables = extract_variables(selections, schema.query_type, schema)
+    # Then variables with the same argument names get unique names in the document order
+    assert variables == {
+        "first": 1,
+        "filter": {"color": "RED", "tags": ["a"]},
+        "first_1": 2,
+        "first_2": 3,
+        "id": 4,
+        "first_3": 5,
+    }
+    # And their types are the same as the types of arguments
+    assert [printers.print_compact.variable_definition(definition) for definition in definitions] == [
+        "$first:Int",
+        "$filter:Filter",
+        "$first_1:Int!",
+        "$first_2:Int!",
+        "$id:ID!",
+        "$first_3:Int!",
+    ]
+    printed = printers.print_compact(
+        graphql.DocumentNode(
+            definitions=[
+                graphql.OperationDefinitionNode(
+                    operation=graphql.OperationType.QUERY,
+                    variable_definitions=definitions,
+                    selection_set=graphql.SelectionSetNode(selections=extracted),
+                )
+            ]
+        )
+    )
+    assert printed == (
+        "query($first:Int,$filter:Filter,$first_1:Int!,$first_2:Int!,$id:ID!,$first_3:Int!)"
+        "{books(first:$first,filter:$filter){related(first:$first_1){related(first:$first_2){id}}} "
+        "node(id:$id){...on Author{books(first:$first_3){id}} __typename}}"
+    )
+    # And the original nodes are not modified
+    assert graphql.print_ast(document).startswith('{\n  books(first: 1, filter: {color: RED, tags: ["a"]})')
+
+
+def extract_compact(query):
+    schema = cached_build_schema(SCHEMA)
+    selections = graphql.parse(query).definitions[0].selection_set.selections
+    extracted, definitions, variables = extract_variables(selections, schema.query_type, schema)
+    printed = printers.print_compact(
+        graphql.DocumentNode(
+            definitions=[
+                graphql.OperationDefinitionNode(
+                    operation=graphql.OperationType.QUERY,
+                    variable_definitions=definitions,
+                    selection_set=graphql.SelectionSetNode(selections=extracted),
+                )
+            ]
+        )
+    )
+    return printed, variables
+
+
+def test_variables_from_custom_scalars():
+    # When strategies for custom scalars generate variables
+    printed, variables = extract_compact(
+        '{ books(first: $n, filter: {tags: ["a"], created: $first}) { related(first: $n, filter: {created: $first}) '
+        "{ id } } node(id: 2) { ... on Author { books(first: 3) { id } } } }"
+    )
+    # Then arguments with them are left as is
+    # And these variables are declared with types of their positions, the stricter one if they differ
+    # And extracted arguments don't reuse their names
+    assert printed == (
+        "query($n:Int!,$first:Date,$id:ID!,$first_1:Int!)"
+        '{books(first:$n,filter:{tags:["a"],created:$first}){related(first:$n,filter:{created:$first}){id}} '
+        "node(id:$id){...on Author{books(first:$first_1){id}}}}"
+    )
+    # And they have no values
+    assert variables == {"id": 2, "first_1": 3}
+
+
+def test_variables_from_custom_scalars_incompatible():
+    # When strategies for custom scalars generate the same variable for positions of incompatible types
+    # Then it is an error
+    with pytest.raises(InvalidArgument, match="Variable `\\$x` is generated for positions of incompatible types"):
+        extract_compact("{ books(first: $x, filter: {created: $x}) { id } }")
+
+
+@given(data=st.data())
+def test_variables_from_custom_scalars_valid(data):
+    custom_scalars = {
+        "Date": st.sampled_from(["date", "other"]).map(
+            lambda name: graphql.VariableNode(name=graphql.NameNode(value=name))
+        )
+    }
+    # When strategies for custom scalars generate variables in variables mode
+    query, variables = data.draw(from_schema(SCHEMA, custom_scalars=custom_scalars, variables=True))
+    # Then the operation is valid, and these variables are declared without values
+    document = validate_variables(SCHEMA, query, variables)
+    assert "date" not in variables and "other" not in variables
+    names = {definition.variable.name.value for definition in document.definitions[0].variable_definitions or ()}
+    assert set(variables) <= names